@@ -293,6 +293,26 @@ impl PyReplSession {
 
         Ok(session.drain_stderr())
     }
+
+    /// Check whether stdout lines are waiting to be drained
+    ///
+    /// Cheap check that lets callers skip drain_stdout() when idle.
+    fn has_pending_stdout(&self) -> bool {
+        self.inner
+            .as_ref()
+            .map(|s| s.has_pending_stdout())
+            .unwrap_or(false)
+    }
+
+    /// Check whether stderr lines are waiting to be drained
+    ///
+    /// Cheap check that lets callers skip drain_stderr() when idle.
+    fn has_pending_stderr(&self) -> bool {
+        self.inner
+            .as_ref()
+            .map(|s| s.has_pending_stderr())
+            .unwrap_or(false)
+    }
 }
 
 /// Generate a companion lib crate from a user's project
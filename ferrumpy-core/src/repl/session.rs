@@ -1282,7 +1282,7 @@ macro_rules! restore {
     ///
     /// Returns a vector of output lines.
     pub fn drain_stdout(&mut self) -> Vec<String> {
-        let mut output = Vec::new();
+        let mut output = Vec::with_capacity(self.stdout.len());
         while let Ok(line) = self.stdout.try_recv() {
             output.push(line);
         }
@@ -1296,12 +1296,22 @@ macro_rules! restore {
     ///
     /// Returns a vector of error lines.
     pub fn drain_stderr(&mut self) -> Vec<String> {
-        let mut output = Vec::new();
+        let mut output = Vec::with_capacity(self.stderr.len());
         while let Ok(line) = self.stderr.try_recv() {
             output.push(line);
         }
         output
     }
+
+    /// Check whether stdout lines are waiting to be drained
+    pub fn has_pending_stdout(&self) -> bool {
+        !self.stdout.is_empty()
+    }
+
+    /// Check whether stderr lines are waiting to be drained
+    pub fn has_pending_stderr(&self) -> bool {
+        !self.stderr.is_empty()
+    }
 }
 
 #[cfg(test)]
@@ -0,0 +1,80 @@
+"""
+FerrumPy JSON helpers
+
+Serializes snapshot data with the fastest available encoder:
+orjson, then ujson, then the stdlib json module. The accelerated
+packages are optional since LLDB's embedded Python may not have them.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import orjson
+    # Let array-backed values pass through without a tolist() conversion
+    _ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    orjson = None
+
+ujson = None
+if orjson is None:
+    try:
+        import ujson
+    except ImportError:
+        pass
+
+
+def dumps(obj: Any) -> str:
+    """Serialize obj to a compact JSON string."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTS).decode('utf-8')
+        except TypeError:
+            # orjson rejects e.g. integers wider than 64 bits (u128)
+            pass
+    elif ujson is not None:
+        try:
+            return ujson.dumps(obj, escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            pass
+    return json.dumps(obj)
+
+
+def dumps_text(obj: Any, indent: Optional[int] = 2) -> str:
+    """Serialize obj for display: non-ASCII kept, unknown objects via str()."""
+    if orjson is not None and indent in (None, 2):
+        option = _ORJSON_OPTS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTS
+        try:
+            return orjson.dumps(obj, default=str, option=option).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=indent, ensure_ascii=False, default=str)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize obj to compact UTF-8 encoded JSON."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTS)
+        except TypeError:
+            pass
+    return dumps(obj).encode('utf-8')
+
+
+def write(obj: Any, path: Path):
+    """Write obj to path as indented JSON."""
+    if orjson is not None:
+        try:
+            path.write_bytes(orjson.dumps(obj, option=_ORJSON_OPTS | orjson.OPT_INDENT_2))
+            return
+        except TypeError:
+            pass
+    elif ujson is not None:
+        try:
+            path.write_text(ujson.dumps(obj, indent=2, escape_forward_slashes=False))
+            return
+        except (TypeError, OverflowError):
+            pass
+    with open(path, 'w') as f:
+        json.dump(obj, f, indent=2)
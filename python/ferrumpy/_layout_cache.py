@@ -0,0 +1,31 @@
+"""
+FerrumPy type layout caches
+
+Some lookups (child indices, pointer paths, field offsets) are cached by
+type name. A type name only pins a layout within one debuggee process: a
+rebuilt binary run again, or a different target, can lay out the same name
+differently. Caches created with new_cache() are cleared whenever
+check_process() sees a different process than the one they were filled for.
+"""
+
+from typing import Any, Dict, List
+
+_CACHES: List[Dict[Any, Any]] = []
+_owner = None
+
+
+def new_cache() -> Dict[Any, Any]:
+    """Return an empty dict that is cleared when the debuggee process changes."""
+    cache: Dict[Any, Any] = {}
+    _CACHES.append(cache)
+    return cache
+
+
+def check_process(process) -> None:
+    """Clear every layout cache unless `process` is the one they describe."""
+    global _owner
+    owner = process.GetUniqueID() if process is not None and process.IsValid() else None
+    if owner != _owner:
+        for cache in _CACHES:
+            cache.clear()
+        _owner = owner
@@ -405,13 +405,15 @@ def _cmd_complete(
                     if conn.initialize(current):
                         completions = conn.complete(frame_info, prefix, len(prefix))
                         if completions:
+                            output_lines = []
                             for c in completions:
                                 label = c.get("label", "")
                                 detail = c.get("detail", "")
                                 if detail:
-                                    result.AppendMessage(f"{label}: {detail}")
+                                    output_lines.append(f"{label}: {detail}")
                                 else:
-                                    result.AppendMessage(label)
+                                    output_lines.append(label)
+                            result.AppendMessage("\n".join(output_lines))
                             return
 
         # Fallback: show local variables matching prefix
@@ -424,8 +426,7 @@ def _cmd_complete(
                 matches.append(f"{name}: {type_name}")
 
         if matches:
-            for m in matches:
-                result.AppendMessage(m)
+            result.AppendMessage("\n".join(matches))
         else:
             result.AppendMessage(f"No completions for '{prefix}'")
 
@@ -449,19 +450,23 @@ def _cmd_type(
         value = resolve_path(frame, expr)
         type_obj = value.GetType()
 
-        result.AppendMessage(f"Type: {type_obj.GetName()}")
-        result.AppendMessage(f"Size: {type_obj.GetByteSize()} bytes")
+        output_lines = [
+            f"Type: {type_obj.GetName()}",
+            f"Size: {type_obj.GetByteSize()} bytes",
+        ]
 
         # Show fields for structs
         num_fields = type_obj.GetNumberOfFields()
         if num_fields > 0:
-            result.AppendMessage("Fields:")
+            output_lines.append("Fields:")
             for i in range(num_fields):
                 field = type_obj.GetFieldAtIndex(i)
                 if field.IsValid():
                     field_name = field.GetName() or f"[{i}]"
                     field_type = field.GetType().GetName()
-                    result.AppendMessage(f"  {field_name}: {field_type}")
+                    output_lines.append(f"  {field_name}: {field_type}")
+
+        result.AppendMessage("\n".join(output_lines))
 
     except PathResolutionError as e:
         result.SetError(str(e))
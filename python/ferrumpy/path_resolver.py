@@ -52,6 +52,11 @@ class DerefSegment(PathSegment):
     pass
 
 
+_IDENT_RE = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*')
+# One segment after the leading identifier: .* | .0 | .name | [0]
+_SEGMENT_RE = re.compile(r'\.(?:(\*)|(\d+)|([a-zA-Z_][a-zA-Z0-9_]*))|\[(\d+)\]')
+
+
 def tokenize_path(path: str) -> List[PathSegment]:
     """
     Parse a path string into segments.
@@ -63,54 +68,41 @@ def tokenize_path(path: str) -> List[PathSegment]:
         "box_val.*" -> [IdentSegment("box_val"), DerefSegment()]
     """
     segments: List[PathSegment] = []
-    remaining = path.strip()
+    text = path.strip()
 
     # First segment must be an identifier
-    match = re.match(r'^([a-zA-Z_][a-zA-Z0-9_]*)', remaining)
+    match = _IDENT_RE.match(text)
     if not match:
         raise PathResolutionError(f"Invalid path: expected identifier at start of '{path}'")
 
-    segments.append(IdentSegment(match.group(1)))
-    remaining = remaining[match.end():]
+    segments.append(IdentSegment(match.group()))
+    pos = match.end()
 
-    while remaining:
-        # Field access: .name or .0
-        if remaining.startswith('.'):
-            remaining = remaining[1:]
+    while pos < len(text):
+        match = _SEGMENT_RE.match(text, pos)
+        if match is None:
+            remaining = text[pos:]
+            if remaining.startswith('.'):
+                raise PathResolutionError(f"Invalid field access at: {remaining}")
+            if remaining.startswith('['):
+                raise PathResolutionError(f"Invalid index access at: {remaining}")
+            raise PathResolutionError(f"Unexpected character at: {remaining}")
 
+        deref, tuple_field, field, index = match.groups()
+        if deref:
             # Dereference: .*
-            if remaining.startswith('*'):
-                segments.append(DerefSegment())
-                remaining = remaining[1:]
-                continue
-
+            segments.append(DerefSegment())
+        elif tuple_field is not None:
             # Tuple field: .0, .1, etc.
-            match = re.match(r'^(\d+)', remaining)
-            if match:
-                # Treat as field name (LLDB uses __0, __1 for tuple fields)
-                segments.append(IdentSegment(f"__{match.group(1)}"))
-                remaining = remaining[match.end():]
-                continue
-
+            # Treat as field name (LLDB uses __0, __1 for tuple fields)
+            segments.append(IdentSegment(f"__{tuple_field}"))
+        elif field is not None:
             # Regular field: .name
-            match = re.match(r'^([a-zA-Z_][a-zA-Z0-9_]*)', remaining)
-            if match:
-                segments.append(IdentSegment(match.group(1)))
-                remaining = remaining[match.end():]
-                continue
-
-            raise PathResolutionError(f"Invalid field access at: .{remaining}")
-
-        # Index access: [0]
-        elif remaining.startswith('['):
-            match = re.match(r'^\[(\d+)\]', remaining)
-            if not match:
-                raise PathResolutionError(f"Invalid index access at: {remaining}")
-            segments.append(IndexSegment(int(match.group(1))))
-            remaining = remaining[match.end():]
-
+            segments.append(IdentSegment(field))
         else:
-            raise PathResolutionError(f"Unexpected character at: {remaining}")
+            # Index access: [0]
+            segments.append(IndexSegment(int(index)))
+        pos = match.end()
 
     return segments
 
@@ -11,9 +11,15 @@ from typing import Callable, Dict, Optional
 
 import lldb
 
+from .. import _layout_cache
+
 # Registry of type patterns to formatter functions
 _FORMATTERS: Dict[str, Callable[[lldb.SBValue, "FormatOptions"], str]] = {}
 
+# Resolved type name -> formatter (None when no pattern matches).
+# Populated on demand so each distinct type name is pattern-matched only once.
+_RESOLVED_FORMATTERS: Dict[str, Optional[Callable]] = {}
+
 
 @dataclass
 class FormatOptions:
@@ -27,7 +33,14 @@ class FormatOptions:
 
 
 def register_providers(debugger: lldb.SBDebugger):
-    """Register type formatters with LLDB."""
+    """
+    Register type formatters with LLDB.
+
+    Formatters are currently only used by FerrumPy's own commands and are
+    not registered as LLDB type summaries. Note that `type summary add -F`
+    only binds Python functions; native (C++) summary providers would need
+    an LLDB plugin built against the exact LLDB version, which we don't ship.
+    """
     pass
 
 
@@ -43,6 +56,10 @@ def format_value(
     if not value.IsValid():
         return "<invalid>"
 
+    if depth == 0:
+        # Cached type layouts are only valid for the process they came from
+        _layout_cache.check_process(value.GetProcess())
+
     # Create default options if not provided
     if options is None:
         options = FormatOptions(expand=expand)
@@ -61,19 +78,36 @@ def format_value(
             addr_prefix = f"@ 0x{addr:x} "
 
     # Try to find a matching formatter
-    for pattern, formatter in _FORMATTERS.items():
-        if re.match(pattern, type_name):
-            try:
-                result = formatter(value, options, depth)
-                return addr_prefix + result
-            except Exception:
-                # Fallback to default if formatter fails
-                return addr_prefix + _format_default(value, options, depth)
+    formatter = _resolve_formatter(type_name)
+    if formatter is not None:
+        try:
+            result = formatter(value, options, depth)
+            return addr_prefix + result
+        except Exception:
+            # Fallback to default if formatter fails
+            return addr_prefix + _format_default(value, options, depth)
 
     # Default formatting
     return addr_prefix + _format_default(value, options, depth)
 
 
+def _resolve_formatter(type_name: str) -> Optional[Callable]:
+    """Find the formatter for a type name, caching the result per type name."""
+    try:
+        return _RESOLVED_FORMATTERS[type_name]
+    except KeyError:
+        pass
+
+    formatter = None
+    for pattern, candidate in _FORMATTERS.items():
+        if re.match(pattern, type_name):
+            formatter = candidate
+            break
+
+    _RESOLVED_FORMATTERS[type_name] = formatter
+    return formatter
+
+
 
 def _format_default(value: lldb.SBValue, options: FormatOptions, depth: int) -> str:
     """Default formatter for unknown types."""
@@ -157,6 +191,36 @@ def _format_struct_expanded(value: lldb.SBValue, options: FormatOptions, depth:
 # String Formatters - Using LLDB's summary when available
 # =============================================================================
 
+# String bytes already read during the current stop: (addr, size) -> bytes.
+# Memory only changes while the process runs, so the cache is dropped
+# whenever the (process id, stop id) pair moves on.
+_READ_CACHE: Dict[tuple, bytes] = {}
+_READ_CACHE_MAX = 1024
+_read_cache_stop: Optional[tuple] = None
+
+
+def _read_memory_cached(process: lldb.SBProcess, addr: int, size: int,
+                        error: lldb.SBError) -> Optional[bytes]:
+    """process.ReadMemory(), memoized for the current stop."""
+    global _read_cache_stop
+    # Count expression evaluations too: they run code that may write memory
+    stop = (process.GetProcessID(), process.GetStopID(True))
+    if stop != _read_cache_stop:
+        _READ_CACHE.clear()
+        _read_cache_stop = stop
+
+    key = (addr, size)
+    data = _READ_CACHE.get(key)
+    if data is None:
+        data = process.ReadMemory(addr, size, error)
+        if error.Fail():
+            return data
+        if len(_READ_CACHE) >= _READ_CACHE_MAX:
+            _READ_CACHE.clear()
+        _READ_CACHE[key] = data
+    return data
+
+
 def _format_string(value: lldb.SBValue, options: FormatOptions, depth: int = 0) -> str:
     """Format alloc::string::String."""
     # First try LLDB's built-in summary
@@ -204,7 +268,7 @@ def _format_string(value: lldb.SBValue, options: FormatOptions, depth: int = 0)
     error = lldb.SBError()
     process = value.GetProcess()
     max_len = min(length, 256)  # Limit read size
-    data = process.ReadMemory(ptr_addr, max_len, error)
+    data = _read_memory_cached(process, ptr_addr, max_len, error)
 
     if error.Fail():
         return f'"<error reading {length} bytes>"'
@@ -221,6 +285,24 @@ def _format_string(value: lldb.SBValue, options: FormatOptions, depth: int = 0)
         return f'"<invalid UTF-8, {length} bytes>"'
 
 
+# Define known path patterns for different Rust versions
+# Each pattern is a tuple of field names to traverse
+_POINTER_PATTERNS = (
+    # Rust 1.70+ with RawVecInner
+    ("inner", "ptr", "pointer", "pointer"),
+    # Rust 1.60+ without RawVecInner
+    ("ptr", "pointer", "pointer"),
+    # Older versions or simpler wrappers
+    ("ptr", "pointer"),
+    # Direct pointer (rare)
+    ("pointer",),
+)
+
+# RawVec type name -> pattern that located its data pointer.
+# The layout is fixed per compiled type, so the search runs once per type.
+_BUF_POINTER_PATTERNS: Dict[str, tuple] = {}
+
+
 def _find_pointer_in_buf(buf: lldb.SBValue) -> Optional[lldb.SBValue]:
     """
     Navigate through RawVec/Unique/NonNull to find the actual data pointer.
@@ -235,23 +317,18 @@ def _find_pointer_in_buf(buf: lldb.SBValue) -> Optional[lldb.SBValue]:
     - Rust 1.60+: buf.ptr.pointer.pointer
     - Older: buf.ptr.pointer
     """
-    # Define known path patterns for different Rust versions
-    # Each pattern is a list of field names to traverse
-    POINTER_PATTERNS = [
-        # Rust 1.70+ with RawVecInner
-        ["inner", "ptr", "pointer", "pointer"],
-        # Rust 1.60+ without RawVecInner
-        ["ptr", "pointer", "pointer"],
-        # Older versions or simpler wrappers
-        ["ptr", "pointer"],
-        # Direct pointer (rare)
-        ["pointer"],
-    ]
-
-    for pattern in POINTER_PATTERNS:
+    type_name = buf.GetType().GetName()
+    pattern = _BUF_POINTER_PATTERNS.get(type_name)
+    if pattern is not None:
+        result = _navigate_path(buf, pattern)
+        if result is not None and result.IsValid():
+            return result
+
+    for pattern in _POINTER_PATTERNS:
         result = _navigate_path(buf, pattern)
         if result is not None and result.IsValid():
             # Verify it looks like a pointer (has non-zero address for non-empty strings)
+            _BUF_POINTER_PATTERNS[type_name] = pattern
             return result
 
     return None
@@ -279,6 +356,44 @@ def _navigate_path(value: lldb.SBValue, path: list) -> Optional[lldb.SBValue]:
     return current
 
 
+# (type name, field path) -> child index path, or None if the path is
+# absent; valid for the current process only
+_CHILD_INDEX_PATHS: Dict[tuple, Optional[tuple]] = _layout_cache.new_cache()
+
+
+def _navigate_path_cached(value: lldb.SBValue, path: tuple) -> Optional[lldb.SBValue]:
+    """
+    Like _navigate_path, but resolves field names to child indices once per type.
+
+    Subsequent values of the same type are walked with GetChildAtIndex only,
+    skipping the by-name member lookups.
+    """
+    key = (value.GetType().GetName(), path)
+    indices = _CHILD_INDEX_PATHS.get(key, ())
+    if indices is None:
+        return None
+
+    if indices:
+        current = value
+        for index in indices:
+            current = current.GetChildAtIndex(index)
+        return current if current.IsValid() else None
+
+    # First sighting of this type: resolve and record the index path
+    resolved = []
+    current = value
+    for field_name in path:
+        index = current.GetIndexOfChildWithName(field_name)
+        if index >= current.GetNumChildren():
+            _CHILD_INDEX_PATHS[key] = None
+            return None
+        resolved.append(index)
+        current = current.GetChildAtIndex(index)
+
+    _CHILD_INDEX_PATHS[key] = tuple(resolved)
+    return current if current.IsValid() else None
+
+
 def _escape_string(text: str) -> str:
     """Escape special characters for display."""
     return (text
@@ -387,6 +502,46 @@ def _format_vec(value: lldb.SBValue, options: FormatOptions, depth: int = 0) ->
 # Option/Result Formatters - Simplified
 # =============================================================================
 
+# Inner types whose Option<T> is stored as a single non-null pointer word
+_NICHE_POINTER_PREFIXES = (
+    "&",
+    "alloc::boxed::Box<",
+    "alloc::sync::Arc<",
+    "alloc::rc::Rc<",
+    "core::ptr::non_null::NonNull<",
+)
+
+# Option type name -> whether it uses the niche-pointer layout; valid for
+# the current process only
+_NICHE_OPTION_TYPES: Dict[str, bool] = _layout_cache.new_cache()
+
+
+def _get_niche_pointer_inner_type(value: lldb.SBValue) -> Optional[lldb.SBType]:
+    """
+    Return T for Option<T> when T is a thin non-null pointer, else None.
+
+    rustc stores such an Option as one pointer-sized word where 0 means None,
+    so the value can be decoded without walking $variants$.
+    The layout decision is cached per Option type name; the SBType itself
+    always comes from the value, so it belongs to the current module.
+    """
+    option_type = value.GetType()
+    type_name = option_type.GetName()
+    is_niche = _NICHE_OPTION_TYPES.get(type_name)
+    if is_niche is False:
+        return None
+
+    candidate = option_type.GetTemplateArgumentType(0)
+    if is_niche is None:
+        is_niche = False
+        if candidate.IsValid() and (candidate.GetName() or "").startswith(_NICHE_POINTER_PREFIXES):
+            ptr_size = value.GetTarget().GetAddressByteSize()
+            is_niche = candidate.GetByteSize() == option_type.GetByteSize() == ptr_size
+        _NICHE_OPTION_TYPES[type_name] = is_niche
+
+    return candidate if is_niche else None
+
+
 def _format_option(value: lldb.SBValue, options: FormatOptions, depth: int = 0) -> str:
     """Format core::option::Option<T>."""
     type_name = value.GetType().GetName()
@@ -397,30 +552,36 @@ def _format_option(value: lldb.SBValue, options: FormatOptions, depth: int = 0)
 
     if type_name.endswith("::Some"):
         inner = _get_enum_payload(value, 1)  # Some is variant 1
-        if inner.IsValid():
+        if inner is not None:
             inner_str = format_value(inner, depth=depth+1, options=options)
             return f"Some({inner_str})"
         return "Some(?)"
 
+    # Fast path: Option<Box<T>>, Option<&T>, ... is a single pointer word
+    niche_type = _get_niche_pointer_inner_type(value)
+    if niche_type is not None:
+        data = value.GetData()
+        error = lldb.SBError()
+        raw = data.GetAddress(error, 0)
+        if error.Success():
+            if raw == 0:
+                return "None"
+            inner = value.CreateValueFromData("__0", data, niche_type)
+            if inner.IsValid():
+                return f"Some({format_value(inner, depth=depth+1, options=options)})"
+
     # Check for $variants$ structure (common in LLDB for Rust enums)
-    variants = value.GetChildMemberWithName("$variants$")
-    if variants.IsValid():
-        # For Option: $variant$1 contains Some value
-        variant1 = variants.GetChildMemberWithName("$variant$1")
-        if variant1.IsValid():
-            discr = variant1.GetChildMemberWithName("$discr$")
-            if discr.IsValid():
-                discr_val = discr.GetValueAsUnsigned()
-                if discr_val == 0:
-                    return "None"
-                else:
-                    # Get the actual value from value.__0
-                    val_wrapper = variant1.GetChildMemberWithName("value")
-                    if val_wrapper.IsValid():
-                        inner = val_wrapper.GetChildMemberWithName("__0")
-                        if inner.IsValid():
-                            return f"Some({format_value(inner, depth=depth+1, options=options)})"
-                    return "Some(?)"
+    # For Option: $variant$1 contains Some value
+    discr = _navigate_path_cached(value, ("$variants$", "$variant$1", "$discr$"))
+    if discr is not None:
+        discr_val = discr.GetValueAsUnsigned()
+        if discr_val == 0:
+            return "None"
+        # Get the actual value from value.__0
+        inner = _navigate_path_cached(value, ("$variants$", "$variant$1", "value", "__0"))
+        if inner is not None:
+            return f"Some({format_value(inner, depth=depth+1, options=options)})"
+        return "Some(?)"
 
     # For simple discriminant at top level
     discr = value.GetChildMemberWithName("$discr$")
@@ -429,20 +590,17 @@ def _format_option(value: lldb.SBValue, options: FormatOptions, depth: int = 0)
         if discr_val == 0:
             return "None"
         inner = _get_enum_payload_simple(value)
-        if inner.IsValid():
+        if inner is not None:
             return f"Some({format_value(inner, depth=depth+1, options=options)})"
         return "Some(?)"
 
-    # Try LLDB summary
-    summary = value.GetSummary()
-    if summary:
-        return summary
+    # No variant layout matched: the value is malformed (no summary is
+    # registered for Option, so asking LLDB for one is wasted work)
+    return "?"
 
-    return _format_default(value, options, depth)
 
-
-def _get_enum_payload_simple(value: lldb.SBValue) -> lldb.SBValue:
-    """Get payload from simple enum structure (no $variants$)."""
+def _get_enum_payload_simple(value: lldb.SBValue) -> Optional[lldb.SBValue]:
+    """Get payload from simple enum structure (no $variants$), or None if absent."""
     # Try 'value' child with __0
     payload = value.GetChildMemberWithName("value")
     if payload.IsValid():
@@ -459,10 +617,10 @@ def _get_enum_payload_simple(value: lldb.SBValue) -> lldb.SBValue:
     if inner.IsValid():
         return inner
 
-    return lldb.SBValue()
+    return None
 
 
-def _get_enum_payload(value: lldb.SBValue, variant_index: int) -> lldb.SBValue:
+def _get_enum_payload(value: lldb.SBValue, variant_index: int) -> Optional[lldb.SBValue]:
     """Get payload from Rust enum with $variants$ structure."""
     variants = value.GetChildMemberWithName("$variants$")
     if variants.IsValid():
@@ -486,13 +644,13 @@ def _format_result(value: lldb.SBValue, options: FormatOptions, depth: int = 0)
     # Check type name for variant
     if type_name.endswith("::Ok"):
         inner = _get_enum_payload(value, 0)
-        if inner.IsValid():
+        if inner is not None:
             return f"Ok({format_value(inner, options=options)})"
         return "Ok(?)"
 
     if type_name.endswith("::Err"):
         inner = _get_enum_payload(value, 1)
-        if inner.IsValid():
+        if inner is not None:
             return f"Err({format_value(inner, options=options)})"
         return "Err(?)"
 
@@ -550,20 +708,16 @@ def _format_result(value: lldb.SBValue, options: FormatOptions, depth: int = 0)
         discr_val = discr.GetValueAsUnsigned()
         inner = _get_enum_payload_simple(value)
         if discr_val == 0:
-            if inner.IsValid():
+            if inner is not None:
                 return f"Ok({format_value(inner, options=options)})"
             return "Ok(?)"
         else:
-            if inner.IsValid():
+            if inner is not None:
                 return f"Err({format_value(inner, options=options)})"
             return "Err(?)"
 
-    # Use summary if available
-    summary = value.GetSummary()
-    if summary:
-        return summary
-
-    return _format_default(value, options, 0)
+    # No variant layout matched: the value is malformed
+    return "?"
 
 
 # =============================================================================
@@ -614,7 +768,9 @@ def _format_arc(value: lldb.SBValue, options: FormatOptions, depth: int = 0) ->
                         return f"Arc({data_str})  (strong={s}, weak={w})"
                     return f"Arc({data_str})"
 
-    # Fallback: show summary or default
+        return "Arc(...)"
+
+    # Fallback: unknown layout, show summary if LLDB has one
     summary = value.GetSummary()
     if summary:
         return f"Arc({summary})"
@@ -643,6 +799,7 @@ def _format_rc(value: lldb.SBValue, options: FormatOptions, depth: int = 0) -> s
                         s = strong.GetValueAsUnsigned()
                         return f"Rc({data_str})  (strong={s})"
                     return f"Rc({data_str})"
+        return "Rc(...)"
 
     summary = value.GetSummary()
     if summary:
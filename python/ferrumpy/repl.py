@@ -5,14 +5,17 @@ Manages the lifecycle of an evcxr REPL session with variables
 captured from an LLDB debugging session.
 """
 
-import json
 import os
-import shutil
-import subprocess
+import re
 import sys
-import tempfile
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+# subprocess, tempfile and shutil are imported where used: most callers only
+# need EmbeddedReplSession, which never touches them.
+if TYPE_CHECKING:
+    import subprocess
 
 # NOTE: OutputDrainer is disabled because:
 # 1. evcxr now has background threads that drain stdout/stderr internally
@@ -66,8 +69,82 @@ try:
 except ImportError:
     lldb = None
 
+from . import _json
 from .serializer import serialize_frame
 
+# Line patterns used when transforming main.rs into a lib crate
+_RE_FN_MAIN = re.compile(r'\s*fn\s+main\s*\(')
+_RE_TYPE_DECL = re.compile(r'\s*(?:struct|enum)\s+\w+')
+_RE_FN = re.compile(r'\s*fn\s+\w+')
+
+# [dependencies] section of a user's Cargo.toml
+_RE_DEPS = re.compile(r'\[dependencies\](.*?)(?=\[|\Z)', re.DOTALL)
+
+# Base Cargo.toml for the generated snapshot lib crate
+_LIB_CARGO_TOML = """[package]
+name = "ferrumpy_snapshot_lib"
+version = "0.1.5"
+edition = "2021"
+
+[lib]
+crate-type = ["rlib"]
+
+[dependencies]
+serde = { version = "1", features = ["derive"] }
+serde_json = "1"
+"""
+
+# Cargo.toml for the REPL project that depends on the snapshot lib
+_REPL_CARGO_TEMPLATE = """[package]
+name = "ferrumpy_repl"
+version = "0.1.5"
+edition = "2021"
+
+[dependencies]
+ferrumpy_snapshot_lib = {{ path = "{lib_path}" }}
+serde = {{ version = "1", features = ["derive"] }}
+serde_json = "1"
+"""
+
+# Simple-mode REPL prompt and exit commands
+_PROMPT = ">> "
+_EXIT_CMDS = frozenset({':q', ':quit', ':exit'})
+
+
+# Session temp dirs are renamed to this prefix before being deleted, so a
+# removal cut short at interpreter exit is finished by the next session
+_TRASH_PREFIX = "ferrumpy_trash_"
+_trash_swept = False
+
+
+def _rmtree_in_background(*paths: str):
+    """Delete directory trees on a daemon thread."""
+    import shutil
+
+    def remove():
+        for path in paths:
+            shutil.rmtree(path, ignore_errors=True)
+
+    threading.Thread(target=remove, daemon=True).start()
+
+
+def _sweep_trash():
+    """Delete trash dirs left behind by earlier sessions (once per process)."""
+    global _trash_swept
+    if _trash_swept:
+        return
+    _trash_swept = True
+
+    import tempfile
+    try:
+        with os.scandir(tempfile.gettempdir()) as entries:
+            leftovers = [entry.path for entry in entries
+                         if entry.name.startswith(_TRASH_PREFIX) and entry.is_dir(follow_symlinks=False)]
+    except OSError:
+        return
+    if leftovers:
+        _rmtree_in_background(*leftovers)
+
 
 class ReplSession:
     """Manages an evcxr REPL session with captured debug state."""
@@ -85,6 +162,7 @@ class ReplSession:
         self.temp_dir: Optional[Path] = None
         self.process: Optional[subprocess.Popen] = None
         self.serialized_data: Dict[str, Any] = {}
+        self._init_written = False  # init.evcxr is up to date
 
     def prepare(self) -> str:
         """
@@ -93,6 +171,11 @@ class ReplSession:
         Returns:
             Path to the generated REPL project
         """
+        import tempfile
+
+        # Finish removing temp dirs an earlier exit left half-deleted
+        _sweep_trash()
+
         # Create temp directory
         self.temp_dir = Path(tempfile.mkdtemp(prefix="ferrumpy_repl_"))
 
@@ -108,13 +191,12 @@ class ReplSession:
 
         # 4. Write serialized data
         data_path = self.temp_dir / "data.json"
-        with open(data_path, 'w') as f:
-            json.dump(self.serialized_data, f, indent=2)
+        _json.write(self.serialized_data, data_path)
 
         # 5. Generate init code
-        init_code = self.generate_init_code()
         init_file = self.temp_dir / "init.evcxr"
-        init_file.write_text(init_code)
+        init_file.write_bytes(self._generate_init_bytes())
+        self._init_written = True
 
         return str(self.temp_dir)
 
@@ -144,8 +226,10 @@ class ReplSession:
         user_lib = self.project_path / "src" / "lib.rs"
 
         if user_lib.exists():
-            # User has lib.rs, just copy it
-            shutil.copy(user_lib, src_dir / "lib.rs")
+            # User has lib.rs, just copy it (shutil uses the kernel's
+            # zero-copy primitives where available)
+            import shutil
+            shutil.copyfile(user_lib, src_dir / "lib.rs")
         elif user_main.exists():
             # Transform main.rs to lib.rs
             content = user_main.read_text()
@@ -159,12 +243,12 @@ class ReplSession:
 
     def _transform_to_lib(self, content: str) -> str:
         """Transform main.rs content to lib.rs format."""
-        import re
-
         lines = content.split('\n')
         result = []
         in_main = False
         brace_count = 0
+        # Whether the attribute block directly above the current line has a derive
+        has_derive = False
 
         # Add serde import
         result.append("use serde::{Serialize, Deserialize};")
@@ -172,7 +256,7 @@ class ReplSession:
 
         for line in lines:
             # Skip fn main
-            if re.match(r'\s*fn\s+main\s*\(', line):
+            if _RE_FN_MAIN.match(line):
                 in_main = True
                 brace_count = line.count('{') - line.count('}')
                 continue
@@ -184,56 +268,51 @@ class ReplSession:
                 continue
 
             # Make structs/enums public and add serde derive
-            if re.match(r'\s*struct\s+\w+', line) or re.match(r'\s*enum\s+\w+', line):
+            if _RE_TYPE_DECL.match(line):
                 # Add derive if not present
-                if not any('#[derive' in prev for prev in result[-3:]):
+                if not has_derive:
                     result.append('#[derive(Debug, Clone, Serialize, Deserialize)]')
                 # Make public
                 if not line.strip().startswith('pub'):
                     line = 'pub ' + line.lstrip()
 
             # Make functions public
-            if re.match(r'\s*fn\s+\w+', line) and not line.strip().startswith('pub'):
+            if _RE_FN.match(line) and not line.strip().startswith('pub'):
                 line = 'pub ' + line.lstrip()
 
             result.append(line)
 
+            # Attributes, comments and blank lines keep the block open
+            stripped = line.lstrip()
+            if stripped.startswith('#[derive'):
+                has_derive = True
+            elif stripped and not stripped.startswith(('#[', '//')):
+                has_derive = False
+
         return '\n'.join(result)
 
     def _generate_lib_cargo_toml(self, lib_dir: Path):
         """Generate Cargo.toml for the lib crate."""
         user_cargo = self.project_path / "Cargo.toml"
 
-        cargo_content = """[package]
-name = "ferrumpy_snapshot_lib"
-version = "0.1.5"
-edition = "2021"
-
-[lib]
-crate-type = ["rlib"]
-
-[dependencies]
-serde = { version = "1", features = ["derive"] }
-serde_json = "1"
-"""
+        parts = [_LIB_CARGO_TOML]
 
         # Copy user dependencies if available
         if user_cargo.exists():
             try:
-                import re
                 content = user_cargo.read_text()
-                deps_match = re.search(r'\[dependencies\](.*?)(?=\[|\Z)', content, re.DOTALL)
+                deps_match = _RE_DEPS.search(content)
                 if deps_match:
                     deps = deps_match.group(1).strip()
                     # Filter out existing serde
-                    dep_lines = [dep_line for dep_line in deps.split('\n')
-                                if dep_line.strip() and not dep_line.startswith('serde')]
-                    if dep_lines:
-                        cargo_content += '\n'.join(dep_lines) + '\n'
+                    for dep_line in deps.split('\n'):
+                        if dep_line.strip() and not dep_line.startswith('serde'):
+                            parts.append(dep_line)
+                            parts.append('\n')
             except Exception:
                 pass
 
-        (lib_dir / "Cargo.toml").write_text(cargo_content)
+        (lib_dir / "Cargo.toml").write_text(''.join(parts))
 
     def _create_minimal_lib(self, lib_dir: Path):
         """Create a minimal lib when libgen fails."""
@@ -245,32 +324,12 @@ serde_json = "1"
 pub use std::*;
 """)
 
-        (lib_dir / "Cargo.toml").write_text("""[package]
-name = "ferrumpy_snapshot_lib"
-version = "0.1.5"
-edition = "2021"
-
-[lib]
-crate-type = ["rlib"]
-
-[dependencies]
-serde = { version = "1", features = ["derive"] }
-serde_json = "1"
-""")
+        (lib_dir / "Cargo.toml").write_text(_LIB_CARGO_TOML)
 
     def _create_repl_project(self, lib_path: Path):
         """Create the REPL Cargo project."""
         # This project depends on the generated lib
-        cargo_content = f"""[package]
-name = "ferrumpy_repl"
-version = "0.1.5"
-edition = "2021"
-
-[dependencies]
-ferrumpy_snapshot_lib = {{ path = "{lib_path}" }}
-serde = {{ version = "1", features = ["derive"] }}
-serde_json = "1"
-"""
+        cargo_content = _REPL_CARGO_TEMPLATE.format(lib_path=lib_path)
         (self.temp_dir / "Cargo.toml").write_text(cargo_content)
 
         # Create src directory
@@ -280,33 +339,38 @@ serde_json = "1"
 
     def generate_init_code(self) -> str:
         """Generate evcxr initialization code."""
-        lines = []
+        return self._generate_init_bytes().decode('utf-8')
+
+    def _generate_init_bytes(self) -> bytes:
+        """Generate evcxr initialization code as UTF-8 bytes."""
+        buf = bytearray()
 
         # Add dependencies
-        lines.append(':dep serde = { version = "1", features = ["derive"] }')
-        lines.append(':dep serde_json = "1"')
-        lines.append(f':dep ferrumpy_snapshot_lib = {{ path = "{self.temp_dir}/generated_lib" }}')
-        lines.append('')
+        buf += b':dep serde = { version = "1", features = ["derive"] }\n'
+        buf += b':dep serde_json = "1"\n'
+        buf += f':dep ferrumpy_snapshot_lib = {{ path = "{self.temp_dir}/generated_lib" }}\n\n'.encode()
 
         # Import everything from the lib
-        lines.append('use ferrumpy_snapshot_lib::*;')
-        lines.append('use serde::{Serialize, Deserialize};')
-        lines.append('')
-
-        # Deserialize variables
-        if self.serialized_data.get('variables'):
-            for name, value in self.serialized_data['variables'].items():
-                type_hint = self.serialized_data.get('types', {}).get(name, 'auto')
-                json_str = json.dumps(value)
+        buf += b'use ferrumpy_snapshot_lib::*;\n'
+        buf += b'use serde::{Serialize, Deserialize};\n\n'
+
+        # Deserialize all variables with a single parse, then bind each one
+        variables = self.serialized_data.get('variables')
+        if variables:
+            types = self.serialized_data.get('types', {})
+            buf += b'let mut __ferrumpy_vars = serde_json::from_str::<serde_json::Value>(r#"'
+            buf += _json.dumps_bytes(variables)
+            buf += b'"#).unwrap();\n'
+            for name in variables:
+                type_hint = types.get(name, 'auto')
 
                 # Generate let binding
-                lines.append(f'// {name}: {type_hint}')
-                lines.append(f'let {name} = serde_json::from_str::<serde_json::Value>(r#"{json_str}"#).unwrap();')
+                buf += f'// {name}: {type_hint}\n'.encode()
+                buf += f'let {name} = __ferrumpy_vars["{name}"].take();\n'.encode()
 
-        lines.append('')
-        lines.append('// Variables are ready! Try: user, config, numbers, etc.')
+        buf += b'\n// Variables are ready! Try: user, config, numbers, etc.'
 
-        return '\n'.join(lines)
+        return bytes(buf)
 
     def start_repl(self) -> bool:
         """
@@ -315,20 +379,22 @@ serde_json = "1"
         Returns:
             True if REPL started successfully
         """
+        import shutil
+        import subprocess
+
         if not self.temp_dir:
             self.prepare()
 
-        # Check if evcxr is available
-        try:
-            subprocess.run(['evcxr', '--version'], capture_output=True, check=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        # Check if evcxr is available (PATH lookup only, no process spawn)
+        if not shutil.which('evcxr'):
             print("Error: evcxr not found. Install with: cargo install evcxr_repl")
             return False
 
-        # Generate init code
-        init_code = self.generate_init_code()
+        # Generate init code (prepare() has usually written it already)
         init_file = self.temp_dir / "init.evcxr"
-        init_file.write_text(init_code)
+        if not self._init_written:
+            init_file.write_bytes(self._generate_init_bytes())
+            self._init_written = True
 
         print(f"REPL project: {self.temp_dir}")
         print(f"Init file: {init_file}")
@@ -337,19 +403,33 @@ serde_json = "1"
         print("  evcxr")
         print(f"  # Then paste contents of {init_file}")
 
-        # Start evcxr (interactive mode requires PTY, simplified here)
+        # Start evcxr (interactive mode requires PTY, simplified here).
+        # Run it directly rather than through a shell; exec'ing would replace
+        # the debugger process, so wait for it instead.
         try:
-            os.chdir(self.temp_dir)
-            os.system('evcxr')
+            subprocess.run(['evcxr'], cwd=self.temp_dir)
             return True
         except Exception as e:
             print(f"Error starting REPL: {e}")
             return False
 
     def cleanup(self):
-        """Clean up temporary files."""
+        """
+        Clean up temporary files.
+
+        The directory is renamed to a trash name right away and deleted on
+        a daemon thread, so leaving the session isn't blocked on deleting
+        build artifacts. If the process exits before that finishes, the
+        next session's prepare() removes what is left.
+        """
         if self.temp_dir and self.temp_dir.exists():
-            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            trash = self.temp_dir.with_name(_TRASH_PREFIX + self.temp_dir.name)
+            try:
+                self.temp_dir.rename(trash)
+            except OSError:
+                trash = self.temp_dir
+            self.temp_dir = None
+            _rmtree_in_background(str(trash))
 
     def __enter__(self):
         self.prepare()
@@ -397,6 +477,7 @@ class EmbeddedReplSession:
         self._lib_path = None
         self._lib_name = None
         self._drainer = None  # Background thread for output draining
+        self._project_path_cache = None
 
     def _get_rust_session(self):
         """Get or create the Rust ReplSession."""
@@ -418,23 +499,26 @@ class EmbeddedReplSession:
         if self.project_path:
             return self.project_path
 
+        # Cached from a previous initialize()
+        if self._project_path_cache is not None:
+            return self._project_path_cache
+
+        self._project_path_cache = self._search_project_path()
+        return self._project_path_cache
+
+    def _search_project_path(self) -> Optional[str]:
+        """Walk up from the frame's source directory looking for Cargo.toml."""
         # Try to get from frame's compile unit
         if self.frame:
             compile_unit = self.frame.GetCompileUnit()
             if compile_unit:
                 file_spec = compile_unit.GetFileSpec()
                 if file_spec:
-                    source_dir = os.path.dirname(file_spec.GetDirectory())
-                    # Walk up to find Cargo.toml
-                    current = source_dir
-                    for _ in range(10):
-                        cargo_toml = os.path.join(current, "Cargo.toml")
-                        if os.path.exists(cargo_toml):
-                            return current
-                        parent = os.path.dirname(current)
-                        if parent == current:
-                            break
-                        current = parent
+                    source_dir = Path(os.path.dirname(file_spec.GetDirectory()))
+                    # Walk up (at most 10 levels) to find Cargo.toml
+                    for current in [source_dir, *source_dir.parents][:10]:
+                        if (current / "Cargo.toml").exists():
+                            return str(current)
 
         # Fallback: try current directory
         if os.path.exists("Cargo.toml"):
@@ -499,10 +583,9 @@ class EmbeddedReplSession:
             if self._lib_name:
                 data['lib_name'] = self._lib_name
 
-            json_data = json.dumps(data)
-            type_hints = ",".join(
-                f"{k}:{v}" for k, v in data.get('types', {}).items()
-            )
+            json_data = _json.dumps(data)
+            types = data.get('types', {})
+            type_hints = ",".join([f"{k}:{v}" for k, v in types.items()])
             result = session.load_snapshot(json_data, type_hints)
             self._initialized = True
 
@@ -565,15 +648,21 @@ class EmbeddedReplSession:
 
         session = self._get_rust_session()
 
-        # Drain stdout
-        stdout_lines = session.drain_stdout()
-        for line in stdout_lines:
-            print(line, flush=True)
+        # Drain stdout (one write + flush per stream rather than per line).
+        # The pending check can race with the worker, so the drain may
+        # still come back empty; don't print a blank line then.
+        if session.has_pending_stdout():
+            stdout_lines = session.drain_stdout()
+            if stdout_lines:
+                sys.stdout.write('\n'.join(stdout_lines) + '\n')
+                sys.stdout.flush()
 
         # Drain stderr
-        stderr_lines = session.drain_stderr()
-        for line in stderr_lines:
-            print(line, file=sys.stderr, flush=True)
+        if session.has_pending_stderr():
+            stderr_lines = session.drain_stderr()
+            if stderr_lines:
+                sys.stderr.write('\n'.join(stderr_lines) + '\n')
+                sys.stderr.flush()
 
     def add_dep(self, name: str, spec: str) -> str:
         """
@@ -614,9 +703,10 @@ class EmbeddedReplSession:
         print("Type Rust expressions. Use :q or :exit to quit.")
         print("-" * 40)
 
+        eval_fn = self.eval
         while True:
             try:
-                code = input(">> ")
+                code = input(_PROMPT)
             except (EOFError, KeyboardInterrupt):
                 print("\nExiting...")
                 break
@@ -625,11 +715,11 @@ class EmbeddedReplSession:
             if not code:
                 continue
 
-            if code in (':q', ':quit', ':exit'):
+            if code in _EXIT_CMDS:
                 break
 
             try:
-                result = self.eval(code)
+                result = eval_fn(code)
                 if result:
                     print(result)
             except Exception as e:
@@ -14,9 +14,27 @@ Environment variables:
 - TERM=dumb: Also disables prompt_toolkit (for expect scripts)
 """
 
+import atexit
+import bisect
+import functools
+import importlib.util
+import mmap
 import os
+import queue
+import re
 import sys
-from typing import Any, Callable, Dict, List, Optional
+import threading
+from collections import OrderedDict
+from time import monotonic
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional
+
+# prompt_toolkit is imported lazily by _load_prompt_toolkit(); these are
+# only needed for annotations.
+if TYPE_CHECKING:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.document import Document
+    from prompt_toolkit.key_binding import KeyBindings
 
 # Try to import vendored prompt_toolkit
 _HAS_PROMPT_TOOLKIT = False
@@ -60,33 +78,138 @@ for _vendor_path in _get_vendor_paths():
         sys.path.insert(0, _vendor_path)
         break
 
-try:
+# prompt_toolkit pulls in its whole application stack on import, which is
+# wasted work whenever simple mode ends up being used. Only probe for it
+# here; _load_prompt_toolkit() does the real import on first use.
+_HAS_PROMPT_TOOLKIT = importlib.util.find_spec('prompt_toolkit') is not None
+
+# Bound by _load_prompt_toolkit()
+Completion = None
+ValidationError = None
+
+
+class _AsyncAppendMixin:
+    """
+    FileHistory mixin that appends to disk on a background thread.
+
+    Enter returns as soon as the entry is queued; the append happens
+    concurrently. The parent directory is created on the first write if
+    missing. Pending writes are flushed at interpreter exit.
+    """
+
+    def __init__(self, filename):
+        super().__init__(filename)
+        self._queue: queue.Queue[str] = queue.Queue()
+        threading.Thread(target=self._writer, daemon=True).start()
+        atexit.register(self.flush)
+
+    def store_string(self, string: str) -> None:
+        self._queue.put(string)
+
+    def flush(self):
+        """Block until every queued entry has been written."""
+        self._queue.join()
+
+    def _writer(self):
+        while True:
+            string = self._queue.get()
+            try:
+                try:
+                    super().store_string(string)
+                except FileNotFoundError:
+                    # First write: the history directory may not exist yet
+                    os.makedirs(os.path.dirname(os.path.abspath(self.filename)), exist_ok=True)
+                    super().store_string(string)
+            except OSError:
+                pass  # History is best-effort
+            finally:
+                self._queue.task_done()
+
+
+class _MmapLoadMixin:
+    """
+    FileHistory mixin that reads the history file through mmap.
+
+    Entries are parsed newest-first by scanning backwards for line breaks,
+    so the most recent history is available without reading the whole file
+    line by line. Same on-disk format as FileHistory ('+'-prefixed lines).
+    """
+
+    def load_history_strings(self):
+        try:
+            f = open(self.filename, 'rb')
+        except OSError:
+            return
+        with f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return  # Empty file
+            with mm:
+                yield from _iter_history_entries(mm)
+
+
+def _iter_history_entries(buf):
+    """Yield history entries from a FileHistory buffer, newest first."""
+    parts = []
+    end = len(buf)
+    while end > 0:
+        start = buf.rfind(b'\n', 0, end - 1) + 1
+        if buf[start:start + 1] == b'+':
+            parts.append(buf[start + 1:end])
+        elif parts:
+            parts.reverse()
+            # Drop the trailing newline, as FileHistory does
+            yield b''.join(parts).decode('utf-8', errors='replace')[:-1]
+            parts = []
+        end = start
+    if parts:
+        parts.reverse()
+        yield b''.join(parts).decode('utf-8', errors='replace')[:-1]
+
+
+@functools.lru_cache(maxsize=1)
+def _load_prompt_toolkit() -> SimpleNamespace:
+    """
+    Import prompt_toolkit and bind the REPL helpers to its base classes.
+
+    Raises:
+        ImportError: If prompt_toolkit cannot be imported
+    """
+    global Completion, ValidationError
+
     from prompt_toolkit import PromptSession
     from prompt_toolkit.completion import Completer, Completion
-    from prompt_toolkit.document import Document
     from prompt_toolkit.history import FileHistory, InMemoryHistory
     from prompt_toolkit.key_binding import KeyBindings
     from prompt_toolkit.styles import Style
     from prompt_toolkit.validation import ValidationError, Validator
-    _HAS_PROMPT_TOOLKIT = True
-except ImportError:
-    # Define dummy classes so code can still be parsed
-    class Completer:
-        pass
 
-    class Completion:
-        pass
+    return SimpleNamespace(
+        PromptSession=PromptSession,
+        InMemoryHistory=InMemoryHistory,
+        KeyBindings=KeyBindings,
+        Style=Style,
+        FastFileHistory=type(
+            'FastFileHistory', (_AsyncAppendMixin, _MmapLoadMixin, FileHistory), {}),
+        RustCompleter=type('RustCompleter', (RustCompleter, Completer), {}),
+        RustValidator=type('RustValidator', (RustValidator, Validator), {}),
+    )
 
-    class Document:
-        pass
 
-    class Validator:
-        pass
-
-    class ValidationError(Exception):
-        pass
+@functools.lru_cache(maxsize=1)
+def _stdio_is_tty() -> bool:
+    """
+    Check whether both stdin and stdout are TTYs.
 
-    _HAS_PROMPT_TOOLKIT = False
+    The result is cached: the debugger's stdio doesn't change during a
+    session. Call _reset_mode_cache() to re-probe (e.g. in tests).
+    """
+    stdin_isatty = getattr(sys.stdin, 'isatty', None)
+    if not (stdin_isatty and stdin_isatty()):
+        return False
+    stdout_isatty = getattr(sys.stdout, 'isatty', None)
+    return bool(stdout_isatty and stdout_isatty())
 
 
 def _should_use_enhanced_mode() -> bool:
@@ -110,34 +233,65 @@ def _should_use_enhanced_mode() -> bool:
     if os.environ.get('TERM', '') == 'dumb':
         return False
 
-    # Check TTY
-    if not (hasattr(sys.stdin, 'isatty') and sys.stdin.isatty()):
-        return False
-    if not (hasattr(sys.stdout, 'isatty') and sys.stdout.isatty()):
-        return False
+    return _stdio_is_tty()
 
-    return True
 
+def _reset_mode_cache():
+    """Forget the cached _stdio_is_tty() result."""
+    _stdio_is_tty.cache_clear()
 
-class RustCompleter(Completer):
+
+# Max number of (text, cursor) positions whose evcxr completions are kept
+_COMPLETION_CACHE_SIZE = 128
+
+
+@functools.cache
+def _command_completion(cmd: str, typed_len: int) -> 'Completion':
+    """Completion for a REPL command; shared since the set is small and fixed."""
+    return Completion(cmd, start_position=-typed_len, display_meta="command")
+
+
+class _LazyMeta:
+    """Completion meta text ("kind: detail"), formatted when first displayed."""
+
+    __slots__ = ('kind', 'detail')
+
+    def __init__(self, kind: str, detail: str):
+        self.kind = kind
+        self.detail = detail
+
+    def __call__(self) -> str:
+        # Format metadata (shown on the right)
+        if self.kind and self.detail:
+            return f"{self.kind}: {self.detail}"
+        return self.kind or self.detail
+
+
+class RustCompleter:
     """
     Tab completion for Rust code using evcxr's completion engine.
 
     Falls back to variable name completion if evcxr completions fail.
+    Subclassed from prompt_toolkit's Completer by _load_prompt_toolkit().
     """
 
     # Rust keywords for fallback completion
-    RUST_KEYWORDS = [
+    RUST_KEYWORDS = tuple(sys.intern(kw) for kw in (
         "let", "mut", "fn", "struct", "impl", "pub", "use", "mod",
         "if", "else", "match", "for", "while", "loop", "break", "continue",
         "return", "true", "false", "self", "Self", "const", "static",
         "trait", "type", "where", "async", "await", "move", "ref",
         "Vec", "String", "Option", "Result", "Some", "None", "Ok", "Err",
-    ]
+    ))
+    _RUST_KEYWORDS_SET = frozenset(RUST_KEYWORDS)
 
     # REPL commands
     COMMANDS = [":q", ":quit", ":exit", ":vars", ":help", ":clear",
                 ":type", ":t", ":dep", ":restart"]
+    _SORTED_COMMANDS = sorted(COMMANDS)
+
+    # Upper bound on evcxr completions turned into Completion objects
+    _MAX_COMPLETIONS = 200
 
     def __init__(self, session=None, snapshot_vars: Optional[List[str]] = None):
         """
@@ -147,8 +301,22 @@ class RustCompleter(Completer):
             session: PyReplSession instance for Rust completions
             snapshot_vars: List of snapshot variable names for fallback completion
         """
+        # (text, cursor_position) -> materialized evcxr completions, LRU order
+        self._compl_cache: OrderedDict[tuple, List[Completion]] = OrderedDict()
+        self.set_snapshot(session, snapshot_vars)
+
+    def set_snapshot(self, session, snapshot_vars: Optional[List[str]]):
+        """Switch to a new REPL session and snapshot variable names."""
         self.session = session
-        self.snapshot_vars = snapshot_vars or []
+        self.snapshot_vars = [sys.intern(name) for name in snapshot_vars or ()]
+        # Sorted, de-duplicated fallback candidates for bisect prefix lookup
+        self._var_set = frozenset(self.snapshot_vars)
+        self._sorted_items = sorted(self._var_set | self._RUST_KEYWORDS_SET)
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        """Drop cached completions (REPL state changed after an eval)."""
+        self._compl_cache.clear()
 
     def get_completions(self, document: 'Document', complete_event) -> 'Completion':
         """Get completions for the current document."""
@@ -156,14 +324,23 @@ class RustCompleter(Completer):
 
         # Handle command completions
         if text.startswith(':'):
-            word = text
-            for cmd in self.COMMANDS:
-                if cmd.startswith(word):
-                    yield Completion(cmd, start_position=-len(word), display_meta="command")
+            commands = self._SORTED_COMMANDS
+            for i in range(bisect.bisect_left(commands, text), len(commands)):
+                cmd = commands[i]
+                if not cmd.startswith(text):
+                    break
+                yield _command_completion(cmd, len(text))
             return
 
         # Try evcxr completions first
         if self.session is not None:
+            key = (document.text, document.cursor_position)
+            cached = self._compl_cache.get(key)
+            if cached is not None:
+                self._compl_cache.move_to_end(key)
+                yield from cached
+                return
+
             try:
                 result = self.session.completions(document.text, document.cursor_position)
                 if result:
@@ -177,28 +354,27 @@ class RustCompleter(Completer):
                         else:
                             start_position = -len(document.get_word_before_cursor())
 
-                        for item in completions:
+                        materialized = []
+                        # The menu only shows a screenful; don't build the tail
+                        for item in completions[:self._MAX_COMPLETIONS]:
                             # 'item' is now a dict with 'code', 'label', 'kind', 'detail'
                             code = item["code"]
                             label = item.get("label", code)
                             kind = item.get("kind", "")
                             detail = item.get("detail", "")
 
-                            # Format metadata (shown on the right)
-                            display_meta = ""
-                            if kind and detail:
-                                display_meta = f"{kind}: {detail}"
-                            elif kind:
-                                display_meta = kind
-                            elif detail:
-                                display_meta = detail
-
-                            yield Completion(
+                            materialized.append(Completion(
                                 code,
                                 start_position=start_position,
-                                display=label,
-                                display_meta=display_meta
-                            )
+                                display=None if label == code else label,
+                                # Formatted only when the menu renders it
+                                display_meta=_LazyMeta(kind, detail) if kind or detail else None
+                            ))
+
+                        self._compl_cache[key] = materialized
+                        if len(self._compl_cache) > _COMPLETION_CACHE_SIZE:
+                            self._compl_cache.popitem(last=False)
+                        yield from materialized
                         return
             except Exception:
                 pass  # Fall back to simple completion
@@ -210,27 +386,42 @@ class RustCompleter(Completer):
         if not word:
             return
 
-        # Combine all completion sources
-        all_items = self.snapshot_vars + self.RUST_KEYWORDS
-        seen = set()
+        # Matches for a prefix form a contiguous run in the sorted list
+        items = self._sorted_items
+        start_position = -len(word)
+        for i in range(bisect.bisect_left(items, word), len(items)):
+            item = items[i]
+            if not item.startswith(word):
+                break
+            meta = "variable" if item in self._var_set else "keyword"
+            yield Completion(item, start_position=start_position, display_meta=meta)
+
 
-        for item in all_items:
-            if item.startswith(word) and item not in seen:
-                seen.add(item)
-                meta = "variable" if item in self.snapshot_vars else "keyword"
-                yield Completion(item, start_position=-len(word), display_meta=meta)
+# Input without brackets, quotes, comments or escapes is always complete
+_SIMPLE_COMPLETE_RE = re.compile(r'[^{(\["\'/\\]*\Z')
 
+# Backslash escape pair (\\", \\\\, \\n, ...) for the fallback string check
+_ESCAPE_PAIR_RE = re.compile(r'\\.', re.DOTALL)
 
-class RustValidator(Validator):
+
+class RustValidator:
     """
     Validate input for multi-line continuation.
 
     Checks for unclosed braces, parentheses, strings, etc.
     Allows double-newline to force submission (escape hatch).
+    Subclassed from prompt_toolkit's Validator by _load_prompt_toolkit().
     """
 
     def __init__(self, session=None):
+        self.set_session(session)
+
+    def set_session(self, session):
+        """Switch to a new REPL session, dropping the cached validity."""
         self.session = session
+        # (text, validity) of the last fragment_validity() call; prompt_toolkit
+        # may validate the same buffer twice in a row
+        self._last_validity = None
 
     def validate(self, document: 'Document'):
         """Validate the document, raising ValidationError if incomplete."""
@@ -244,10 +435,19 @@ class RustValidator(Validator):
         if text.endswith('\n\n'):
             return
 
+        # Nothing that could open a block, string or comment: complete
+        if _SIMPLE_COMPLETE_RE.match(text):
+            return
+
         # Use Rust-side lexical scanner for accurate validation
         if self.session is not None:
             try:
-                validity = self.session.fragment_validity(text)
+                last = self._last_validity
+                if last is not None and last[0] == text:
+                    validity = last[1]
+                else:
+                    validity = self.session.fragment_validity(text)
+                    self._last_validity = (text, validity)
                 if validity == "Incomplete":
                     raise ValidationError(
                         message="Incomplete input: waiting for more code (or double Enter to force)",
@@ -273,72 +473,36 @@ class RustValidator(Validator):
                 message=f"Incomplete input: unclosed braces ({opens} open, {closes} close)",
             )
 
-        # Check for unclosed string
-        in_string = False
-        escape_next = False
-        for char in text:
-            if escape_next:
-                escape_next = False
-                continue
-            if char == '\\':
-                escape_next = True
-            elif char == '"' and not escape_next:
-                in_string = not in_string
-
-        if in_string:
+        # Check for unclosed string: drop escape pairs, then an odd number
+        # of remaining quotes means a string literal is still open
+        unescaped = _ESCAPE_PAIR_RE.sub('', text)
+        if unescaped.count('"') % 2:
             raise ValidationError(
                 message="Unclosed string literal",
             )
 
 
-def create_enhanced_repl(
-    session,
-    snapshot_vars: Optional[Dict[str, str]] = None,
-    history_file: Optional[str] = None,
-) -> Optional['PromptSession']:
-    """
-    Create an enhanced REPL session with prompt_toolkit.
-
-    Args:
-        session: PyReplSession instance
-        snapshot_vars: Dict of variable name -> type name
-        history_file: Path to history file (default: ~/.cache/ferrumpy/repl_history)
-
-    Returns:
-        PromptSession if successful, None if unavailable
-    """
-    if not _should_use_enhanced_mode():
-        return None
-
-    # History
-    if history_file is None:
-        cache_dir = os.path.expanduser("~/.cache/ferrumpy")
-        os.makedirs(cache_dir, exist_ok=True)
-        history_file = os.path.join(cache_dir, "repl_history")
+class _CtrlCState:
+    """Consecutive Ctrl+C presses seen at the prompt."""
 
-    try:
-        history = FileHistory(history_file)
-    except Exception:
-        history = InMemoryHistory()
+    __slots__ = ('count',)
 
-    # Completer
-    var_names = list(snapshot_vars.keys()) if snapshot_vars else []
-    completer = RustCompleter(session=session, snapshot_vars=var_names)
+    def __init__(self):
+        self.count = 0
 
-    # Validator for multi-line
-    validator = RustValidator(session=session)
 
-    # Key bindings
-    bindings = KeyBindings()
-    ctrl_c_count = [0]
+def _make_key_bindings(validator) -> 'KeyBindings':
+    """Build the REPL key bindings (Ctrl+C and smart Enter)."""
+    bindings = _load_prompt_toolkit().KeyBindings()
+    ctrl_c = _CtrlCState()
 
     @bindings.add('c-c')
     def handle_ctrl_c(event):
         """Handle Ctrl+C - clear line on first press, show message on second."""
-        ctrl_c_count[0] += 1
-        if ctrl_c_count[0] >= 2:
+        ctrl_c.count += 1
+        if ctrl_c.count >= 2:
             event.app.output.write("\n(Use :q to exit)\n")
-            ctrl_c_count[0] = 0
+            ctrl_c.count = 0
         else:
             event.current_buffer.reset()
 
@@ -367,15 +531,89 @@ def create_enhanced_repl(
             # Incomplete -> Newline
             buffer.newline()
 
+    return bindings
+
+
+# history_file argument -> PromptSession, reused when the REPL is re-entered
+_PROMPT_SESSIONS: Dict[Optional[str], 'PromptSession'] = {}
+
+
+def refresh_snapshot(
+    prompt_session: 'PromptSession',
+    session,
+    snapshot_vars: Optional[Dict[str, str]] = None,
+):
+    """
+    Point an existing PromptSession at a new REPL session and snapshot.
+
+    History, key bindings and style are left untouched.
+    """
+    var_names = list(snapshot_vars.keys()) if snapshot_vars else []
+    prompt_session.completer.set_snapshot(session, var_names)
+    prompt_session.validator.set_session(session)
+
+
+def create_enhanced_repl(
+    session,
+    snapshot_vars: Optional[Dict[str, str]] = None,
+    history_file: Optional[str] = None,
+) -> Optional['PromptSession']:
+    """
+    Create an enhanced REPL session with prompt_toolkit.
+
+    Args:
+        session: PyReplSession instance
+        snapshot_vars: Dict of variable name -> type name
+        history_file: Path to history file (default: ~/.cache/ferrumpy/repl_history)
+
+    Returns:
+        PromptSession if successful, None if unavailable. The session is
+        created once per history file and refreshed on later calls.
+    """
+    if not _should_use_enhanced_mode():
+        return None
+
+    try:
+        pt = _load_prompt_toolkit()
+    except ImportError:
+        return None
+
+    # Re-entering the REPL: keep the existing session, its history and bindings
+    cached = _PROMPT_SESSIONS.get(history_file)
+    if cached is not None:
+        refresh_snapshot(cached, session, snapshot_vars)
+        return cached
+
+    # History
+    cache_key = history_file
+    if history_file is None:
+        # The directory is created on the first history write
+        history_file = os.path.join(os.path.expanduser("~/.cache/ferrumpy"), "repl_history")
+
+    try:
+        history = pt.FastFileHistory(history_file)
+    except Exception:
+        history = pt.InMemoryHistory()
+
+    # Completer
+    var_names = list(snapshot_vars.keys()) if snapshot_vars else []
+    completer = pt.RustCompleter(session=session, snapshot_vars=var_names)
+
+    # Validator for multi-line
+    validator = pt.RustValidator(session=session)
+
+    # Key bindings
+    bindings = _make_key_bindings(validator)
+
     # Style
-    style = Style.from_dict({
+    style = pt.Style.from_dict({
         'prompt': '#00aa00 bold',
         'continuation': '#888888',
     })
 
     # Create session
     try:
-        prompt_session = PromptSession(
+        prompt_session = pt.PromptSession(
             history=history,
             completer=completer,
             validator=validator,
@@ -387,11 +625,83 @@ def create_enhanced_repl(
             style=style,
             mouse_support=False,
         )
+        _PROMPT_SESSIONS[cache_key] = prompt_session
         return prompt_session
     except Exception:
         return None
 
 
+# Static text, written with one output_callback call each
+_BANNER = "\n".join([
+    "=" * 50,
+    "FerrumPy REPL - Enhanced Mode (prompt_toolkit)",
+    "  • Tab completion enabled",
+    "  • Multi-line input (unclosed braces continue)",
+    "  • History search: Ctrl+R",
+    "  • Commands: :q (quit), :vars, :help",
+    "  • Interrupt: Ctrl+C (twice to exit)",
+    "=" * 50 + "\n",
+])
+
+_HELP_TEXT = "\n".join([
+    "Commands:",
+    "  :q, :quit, :exit  - Exit REPL",
+    "  :vars             - Show captured variables",
+    "  :help             - Show this help",
+    "  :clear            - Clear screen",
+    "  :type <expr>      - Show type of expression",
+    "\nRust Evaluation:",
+    "  Type any Rust expression to evaluate",
+    "  Multi-line: open braces auto-continue",
+    "  Force submit: press Enter twice",
+    "\nInterrupt:",
+    "  Ctrl+C once      - Stop running code",
+    "  Ctrl+C twice     - Exit REPL",
+])
+
+
+class _CommandContext(NamedTuple):
+    """State passed to REPL command handlers."""
+    output_callback: Callable[[str], None]
+    snapshot_vars: Dict[str, str]
+
+
+# Command handlers return True to leave the REPL loop
+
+def _cmd_quit(ctx: _CommandContext) -> bool:
+    ctx.output_callback("Exiting REPL...")
+    return True
+
+
+def _cmd_vars(ctx: _CommandContext) -> bool:
+    ctx.output_callback("Variables:")
+    for name, type_name in ctx.snapshot_vars.items():
+        ctx.output_callback(f"  {name}: {type_name}")
+    return False
+
+
+def _cmd_clear(ctx: _CommandContext) -> bool:
+    # Plain ANSI (home + erase display); no shell round-trip
+    sys.stdout.write("\x1b[H\x1b[2J")
+    sys.stdout.flush()
+    return False
+
+
+def _cmd_help(ctx: _CommandContext) -> bool:
+    ctx.output_callback(_HELP_TEXT)
+    return False
+
+
+_COMMAND_HANDLERS: Dict[str, Callable[[_CommandContext], bool]] = {
+    ':q': _cmd_quit,
+    ':quit': _cmd_quit,
+    ':exit': _cmd_quit,
+    ':vars': _cmd_vars,
+    ':clear': _cmd_clear,
+    ':help': _cmd_help,
+}
+
+
 def run_enhanced_repl(
     session,
     snapshot_data: Dict[str, Any],
@@ -419,14 +729,8 @@ def run_enhanced_repl(
     if prompt_session is None:
         return False  # Need fallback
 
-    output_callback("=" * 50)
-    output_callback("FerrumPy REPL - Enhanced Mode (prompt_toolkit)")
-    output_callback("  • Tab completion enabled")
-    output_callback("  • Multi-line input (unclosed braces continue)")
-    output_callback("  • History search: Ctrl+R")
-    output_callback("  • Commands: :q (quit), :vars, :help")
-    output_callback("  • Interrupt: Ctrl+C (twice to exit)")
-    output_callback("=" * 50 + "\n")
+    output_callback(_BANNER)
+    ctx = _CommandContext(output_callback, snapshot_vars)
 
     last_interrupt_time = None
     INTERRUPT_TIMEOUT = 2.0  # 2 seconds window for second Ctrl+C
@@ -436,54 +740,35 @@ def run_enhanced_repl(
             text = prompt_session.prompt(
                 ">> ",
                 rprompt="[rust]",
-            )
+            ).strip()
 
             # Reset interrupt timer on successful input
             last_interrupt_time = None
 
-            text = text.strip()
-
             if not text:
                 continue
 
             # Handle commands
-            if text in (':q', ':quit', ':exit'):
-                output_callback("Exiting REPL...")
-                break
-
-            if text == ':vars':
-                output_callback("Variables:")
-                for name, type_name in snapshot_vars.items():
-                    output_callback(f"  {name}: {type_name}")
-                continue
-
-            if text == ':help':
-                output_callback("Commands:")
-                output_callback("  :q, :quit, :exit  - Exit REPL")
-                output_callback("  :vars             - Show captured variables")
-                output_callback("  :help             - Show this help")
-                output_callback("  :clear            - Clear screen")
-                output_callback("  :type <expr>      - Show type of expression")
-                output_callback("\nRust Evaluation:")
-                output_callback("  Type any Rust expression to evaluate")
-                output_callback("  Multi-line: open braces auto-continue")
-                output_callback("  Force submit: press Enter twice")
-                output_callback("\nInterrupt:")
-                output_callback("  Ctrl+C once      - Stop running code")
-                output_callback("  Ctrl+C twice     - Exit REPL")
+            handler = _COMMAND_HANDLERS.get(text)
+            if handler is not None:
+                if handler(ctx):
+                    break
                 continue
 
             # Evaluate Rust code
             try:
                 result = eval_callback(text)
+                # New items may be in scope now; don't serve stale completions
+                completer = prompt_session.completer
+                if isinstance(completer, RustCompleter):
+                    completer.invalidate_cache()
                 if result:
                     output_callback(result)
             except Exception as e:
                 error_callback(str(e))
 
         except KeyboardInterrupt:
-            import time
-            current_time = time.time()
+            current_time = monotonic()
 
             # Check if this is a second Ctrl+C within timeout
             if last_interrupt_time and (current_time - last_interrupt_time) < INTERRUPT_TIMEOUT:
@@ -5,12 +5,20 @@ Converts LLDB SBValue objects to JSON-serializable dictionaries
 for transfer to the evcxr REPL environment.
 """
 
+import functools
 import json
 import re
-from typing import Any, Dict, List, Optional, Set
+import struct
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from . import _json, _layout_cache
 
 try:
     import lldb
+
+    from .providers import _find_pointer_in_buf
 except ImportError:
     lldb = None  # For testing outside LLDB
 
@@ -36,6 +44,39 @@ TYPE_NORMALIZATION = [
     (r'^std::collections::hash::map::HashMap<(.+)>$', r'HashMap<\1>'),
 ]
 
+
+def _combine_normalization_rules(rules):
+    """
+    Fuse the rules into one alternation, tried in order like the list.
+
+    Returns the regex and a map from each rule's wrapping group index to its
+    replacement, with backreferences renumbered to the fused group numbers.
+    """
+    alternatives = []
+    replacements = {}
+    group = 1
+    for pattern, replacement in rules:
+        alternatives.append(f'({pattern})')
+        replacements[group] = re.sub(
+            r'\\(\d+)', lambda m, base=group: f'\\g<{base + int(m.group(1))}>', replacement)
+        group += 1 + re.compile(pattern).groups
+    return re.compile('|'.join(alternatives)), replacements
+
+
+_NORMALIZATION_RE, _NORMALIZATION_REPLACEMENTS = _combine_normalization_rules(TYPE_NORMALIZATION)
+
+# C-style array (int[5]) and generic (Outer<Inner>) type names
+_ARRAY_RE = re.compile(r'^(\w+)\[(\d+)\]$')
+_GENERIC_RE = re.compile(r'^([^<]+)<(.+)>$')
+# Characters that matter when splitting generic parameters
+_PARAM_DELIM_RE = re.compile(r'[<>,]')
+
+# Allocator/hasher parameters to remove, as one alternation
+_ALLOCATOR_RE = re.compile(
+    r',\s*(?:alloc::alloc::Global|Global|std::hash::random::RandomState'
+    r'|std::collections::hash::map::RandomState)'
+)
+
 # C/LLDB type to Rust type mapping
 C_TO_RUST_TYPES = {
     # Signed integers
@@ -63,9 +104,38 @@ C_TO_RUST_TYPES = {
     'char': 'char',
 }
 
+C_TO_RUST_TYPES = {k: sys.intern(v) for k, v in C_TO_RUST_TYPES.items()}
+
+# Integer-like element types read in bulk by _serialize_vec -> is signed
+_INT_SIGNEDNESS = {
+    'i8': True, 'i16': True, 'i32': True, 'i64': True, 'isize': True,
+    'u8': False, 'u16': False, 'u32': False, 'u64': False, 'usize': False,
+    'short': True, 'int': True, 'long': True, 'long long': True,
+    'unsigned short': False, 'unsigned int': False,
+    'unsigned long': False, 'unsigned long long': False,
+    'bool': False, '_Bool': False,
+}
+# Element byte size -> struct format code (lowercase: signed)
+_INT_FORMATS = {1: 'b', 2: 'h', 4: 'i', 8: 'q'}
+
+# Well-known std module paths -> bare type name
+KNOWN_MODULE_PATHS = {
+    'alloc::vec::Vec': 'Vec',
+    'alloc::string::String': 'String',
+    'core::option::Option': 'Option',
+    'core::result::Result': 'Result',
+    'alloc::boxed::Box': 'Box',
+    'alloc::sync::Arc': 'Arc',
+    'alloc::rc::Rc': 'Rc',
+    'std::collections::hash::map::HashMap': 'HashMap',
+    'std::collections::HashMap': 'HashMap',
+    'std::cell::RefCell': 'RefCell',
+    'std::cell::Cell': 'Cell',
+}
+
 # Primitive types that can be directly serialized
 # Includes both Rust names and C/LLDB names
-PRIMITIVE_TYPES = {
+PRIMITIVE_TYPES = frozenset({
     # Rust types
     'i8', 'i16', 'i32', 'i64', 'i128', 'isize',
     'u8', 'u16', 'u32', 'u64', 'u128', 'usize',
@@ -79,9 +149,20 @@ PRIMITIVE_TYPES = {
     'long long', 'unsigned long long',
     'float', 'double',
     '_Bool',
+})
+
+# Exact type names whose normalized form is known without any parsing
+_DIRECT_MAP = {
+    k: sys.intern(v) for k, v in {
+        **{t: t for t in PRIMITIVE_TYPES},
+        **KNOWN_MODULE_PATHS,
+        **C_TO_RUST_TYPES,
+        '&str': '&str',
+    }.items()
 }
 
 
+@functools.lru_cache(maxsize=4096)
 def normalize_type_name(lldb_type: str) -> str:
     """
     Convert LLDB type name to clean Rust source type name.
@@ -92,10 +173,24 @@ def normalize_type_name(lldb_type: str) -> str:
     3. Module path simplification (alloc::vec::Vec -> Vec)
     4. Crate path extraction (my_crate::User -> User)
     5. Recursive normalization of nested generics
+
+    Results are memoized: frames repeat the same few LLDB type names, and
+    the cache lives for the whole debugger session. Results are interned,
+    since they end up as dict values compared throughout serialization.
     """
     if not lldb_type:
         return lldb_type
 
+    # Fast path: primitives and well-known std types
+    direct = _DIRECT_MAP.get(lldb_type)
+    if direct is not None:
+        return direct
+
+    return sys.intern(_normalize_type_name(lldb_type))
+
+
+def _normalize_type_name(lldb_type: str) -> str:
+    """Uncached body of normalize_type_name()."""
     # Step 1: Remove all allocator parameters first (before any other processing)
     lldb_type = _remove_allocators(lldb_type)
 
@@ -103,19 +198,22 @@ def normalize_type_name(lldb_type: str) -> str:
     if lldb_type in C_TO_RUST_TYPES:
         return C_TO_RUST_TYPES[lldb_type]
 
+    # Nothing below applies to a name without paths, generics or arrays
+    if '::' not in lldb_type and '<' not in lldb_type and '[' not in lldb_type:
+        return lldb_type
+
     # Step 3: Apply normalization rules (module path simplification)
-    for pattern, replacement in TYPE_NORMALIZATION:
-        if re.match(pattern, lldb_type):
-            result = re.sub(pattern, replacement, lldb_type)
-            # Recursively normalize inner types
-            return _normalize_inner_types(result)
+    m = _NORMALIZATION_RE.match(lldb_type)
+    if m:
+        # Recursively normalize inner types
+        return _normalize_inner_types(m.expand(_NORMALIZATION_REPLACEMENTS[m.lastindex]))
 
     # Step 4: Handle generic types with C types inside
     if '<' in lldb_type:
         return _normalize_generic_type(lldb_type)
 
     # Step 5: Handle C-style arrays (int[5] -> [i32; 5])
-    array_match = re.match(r'^(\w+)\[(\d+)\]$', lldb_type)
+    array_match = _ARRAY_RE.match(lldb_type)
     if array_match:
         elem_type = array_match.group(1)
         size = array_match.group(2)
@@ -131,6 +229,7 @@ def normalize_type_name(lldb_type: str) -> str:
     return lldb_type
 
 
+@functools.lru_cache(maxsize=4096)
 def _remove_allocators(type_str: str) -> str:
     """
     Remove allocator parameters from type strings.
@@ -140,19 +239,11 @@ def _remove_allocators(type_str: str) -> str:
         Vec<Vec<i32, alloc::alloc::Global>, alloc::alloc::Global> -> Vec<Vec<i32>>
         HashMap<String, i32, std::hash::random::RandomState> -> HashMap<String, i32>
     """
-    # Patterns for allocator/hasher parameters to remove
-    allocator_patterns = [
-        r',\s*alloc::alloc::Global',
-        r',\s*Global',
-        r',\s*std::hash::random::RandomState',
-        r',\s*std::collections::hash::map::RandomState',
-    ]
-
-    result = type_str
-    for pattern in allocator_patterns:
-        result = re.sub(pattern, '', result)
+    # Allocator/hasher parameters always follow a comma
+    if ',' not in type_str:
+        return type_str
 
-    return result
+    return _ALLOCATOR_RE.sub('', type_str)
 
 
 def _normalize_generic_type(type_str: str) -> str:
@@ -165,7 +256,7 @@ def _normalize_generic_type(type_str: str) -> str:
         Result<int, alloc::string::String> -> Result<i32, String>
     """
     # Find the outer type name and generic parameters
-    match = re.match(r'^([^<]+)<(.+)>$', type_str)
+    match = _GENERIC_RE.match(type_str)
     if not match:
         return type_str
 
@@ -193,28 +284,28 @@ def _split_generic_params(params: str) -> List[str]:
         "Vec<i32>, Option<String>" -> ["Vec<i32>", "Option<String>"]
     """
     result = []
-    current = ""
     depth = 0
+    start = 0
 
-    for char in params:
+    # Only visit the delimiters; slice each parameter out once
+    for m in _PARAM_DELIM_RE.finditer(params):
+        char = m.group()
         if char == '<':
             depth += 1
-            current += char
         elif char == '>':
             depth -= 1
-            current += char
-        elif char == ',' and depth == 0:
-            result.append(current.strip())
-            current = ""
-        else:
-            current += char
+        elif depth == 0:
+            result.append(params[start:m.start()].strip())
+            start = m.end()
 
-    if current.strip():
-        result.append(current.strip())
+    last = params[start:].strip()
+    if last:
+        result.append(last)
 
     return result
 
 
+@functools.lru_cache(maxsize=4096)
 def _simplify_module_path(type_name: str) -> str:
     """
     Simplify module paths to just the type name.
@@ -225,22 +316,8 @@ def _simplify_module_path(type_name: str) -> str:
         core::option::Option -> Option
         std::collections::HashMap -> HashMap
     """
-    known_types = {
-        'alloc::vec::Vec': 'Vec',
-        'alloc::string::String': 'String',
-        'core::option::Option': 'Option',
-        'core::result::Result': 'Result',
-        'alloc::boxed::Box': 'Box',
-        'alloc::sync::Arc': 'Arc',
-        'alloc::rc::Rc': 'Rc',
-        'std::collections::hash::map::HashMap': 'HashMap',
-        'std::collections::HashMap': 'HashMap',
-        'std::cell::RefCell': 'RefCell',
-        'std::cell::Cell': 'Cell',
-    }
-
-    if type_name in known_types:
-        return known_types[type_name]
+    if type_name in KNOWN_MODULE_PATHS:
+        return KNOWN_MODULE_PATHS[type_name]
 
     # For unknown types, extract last component
     if '::' in type_name:
@@ -249,6 +326,7 @@ def _simplify_module_path(type_name: str) -> str:
     return type_name
 
 
+@functools.lru_cache(maxsize=4096)
 def _extract_type_name(full_path: str) -> str:
     """
     Extract the type name from a full crate path.
@@ -263,7 +341,7 @@ def _extract_type_name(full_path: str) -> str:
 
     # Handle generics: my_crate::Wrapper<T> -> Wrapper<T>
     if '<' in full_path:
-        match = re.match(r'^([^<]+)<(.+)>$', full_path)
+        match = _GENERIC_RE.match(full_path)
         if match:
             outer = match.group(1).split('::')[-1]
             inner = match.group(2)
@@ -274,6 +352,7 @@ def _extract_type_name(full_path: str) -> str:
     return full_path.split('::')[-1]
 
 
+@functools.lru_cache(maxsize=4096)
 def _normalize_inner_types(type_str: str) -> str:
     """
     Recursively normalize types inside generics.
@@ -293,11 +372,15 @@ def _normalize_inner_types(type_str: str) -> str:
     return type_str
 
 
+@functools.lru_cache(maxsize=4096)
 def is_primitive(type_name: str) -> bool:
     """Check if type is a primitive that can be directly serialized."""
+    if type_name in PRIMITIVE_TYPES:
+        return True
     # Strip any references
-    clean = type_name.lstrip('&').strip()
-    return clean in PRIMITIVE_TYPES
+    if type_name[:1] == '&':
+        type_name = type_name.lstrip('&')
+    return type_name.strip() in PRIMITIVE_TYPES
 
 
 def serialize_frame(frame) -> Dict[str, Any]:
@@ -323,6 +406,11 @@ def serialize_frame(frame) -> Dict[str, Any]:
     types = {}
     visited = set()  # Track visited addresses to avoid cycles
 
+    # Cached type layouts are only valid for the process they came from
+    _layout_cache.check_process(frame.GetThread().GetProcess())
+
+    # Pass 1: collect variables with their raw LLDB type names
+    frame_vars = []
     for var in frame.GetVariables(True, True, False, True):
         if not var.IsValid():
             continue
@@ -331,10 +419,18 @@ def serialize_frame(frame) -> Dict[str, Any]:
         if name is None or name.startswith('$'):
             continue
 
+        frame_vars.append((name, var, var.GetType().GetName()))
+
+    # Normalize each distinct type name once
+    normalized = {raw: normalize_type_name(raw) for raw in {raw for _, _, raw in frame_vars}}
+
+    # Pass 2: serialize values
+    for name, var, raw_type in frame_vars:
         try:
-            value = value_to_json(var, visited)
+            # Reuse the type name fetched in pass 1 rather than asking LLDB again
+            value = _typed_value_to_json(var, raw_type, visited, 0)
             variables[name] = value
-            types[name] = normalize_type_name(var.GetType().GetName())
+            types[name] = normalized[raw_type]
         except Exception as e:
             # Skip variables that can't be serialized
             variables[name] = {"__error__": str(e)}
@@ -347,140 +443,224 @@ def value_to_json(value, visited: Optional[Set[int]] = None, depth: int = 0) ->
     """
     Convert an LLDB SBValue to a JSON-serializable value.
     """
-    if visited is None:
-        visited = set()
-
     if not value.IsValid():
         return None
 
+    if visited is None:
+        # Top-level call: make sure cached layouts belong to this process
+        visited = set()
+        _layout_cache.check_process(value.GetProcess())
+
     # Limit recursion depth
     if depth > 20:
         return {"__truncated__": "max depth"}
 
-    type_name = value.GetType().GetName()
+    return _typed_value_to_json(value, value.GetType().GetName(), visited, depth)
 
-    # Check for cycles only on heap pointers (not stack locals)
-    # Heap addresses are typically very high, stack addresses are lower
-    addr = value.GetLoadAddress()
-    # Only track if it looks like a heap pointer (has ptr child or is smart pointer type)
-    is_ptr_type = any(p in type_name for p in ['Arc<', 'Rc<', 'Box<', '*const', '*mut'])
-    if is_ptr_type and addr != 0:
-        if addr in visited:
-            return {"__cycle__": f"0x{addr:x}"}
-        visited.add(addr)
 
-    # Handle primitives
+def _typed_value_to_json(value, type_name: str, visited: Set[int], depth: int) -> Any:
+    """value_to_json() for a valid value whose type name is already known."""
+    # Handle primitives (leaves; never pointers, so no cycle tracking)
     if is_primitive(type_name):
-        return _serialize_primitive(value)
-
-    # Handle String
-    if 'String' in type_name and 'alloc::string::String' in type_name:
-        return _serialize_string(value)
-
-    # Handle &str
-    if type_name == '&str':
-        return _serialize_str_ref(value)
+        return _serialize_primitive(value, type_name)
 
-    # Handle Vec
-    if 'Vec<' in type_name:
-        return _serialize_vec(value, visited, depth)
-
-    # Handle Option
-    if 'Option<' in type_name:
-        return _serialize_option(value, visited, depth)
-
-    # Handle Result
-    if 'Result<' in type_name:
-        return _serialize_result(value, visited, depth)
-
-    # Handle HashMap - use GetSummary() which returns formatted key-value pairs
-    if 'HashMap<' in type_name:
-        return _serialize_hashmap(value, visited, depth)
+    # Check for cycles only on heap pointers (not stack locals)
+    # Only track if it looks like a heap pointer (has ptr child or is smart pointer type)
+    if _is_pointer_type(type_name):
+        addr = value.GetLoadAddress()
+        if addr != 0:
+            if addr in visited:
+                return {"__cycle__": f"0x{addr:x}"}
+            visited.add(addr)
 
-    # Handle Box/Arc/Rc (smart pointers)
-    if any(p in type_name for p in ['Box<', 'Arc<', 'Rc<']):
-        return _serialize_smart_pointer(value, visited, depth)
+    # Handle String, &str, Vec, Option, Result, HashMap and Box/Arc/Rc
+    kind = _classify_type(type_name)
+    if kind is not None:
+        return _KIND_HANDLERS[kind](value, type_name, visited, depth)
 
     # Handle tuples (type name starts with '(')
-    if type_name.startswith('(') and type_name.endswith(')'):
-        return _serialize_tuple(value, visited, depth)
+    if type_name[:1] == '(' and type_name[-1:] == ')':
+        return _serialize_tuple(value, type_name, visited, depth)
 
     # Handle fixed arrays (type contains '[' and ']' like 'int[5]' or '[i32; 5]')
-    if ('[' in type_name and ']' in type_name) or type_name.startswith('['):
-        return _serialize_fixed_array(value, visited, depth)
+    if '[' in type_name and (']' in type_name or type_name[:1] == '['):
+        return _serialize_fixed_array(value, type_name, visited, depth)
 
     # Handle user-defined enums
     variants = value.GetChildMemberWithName('$variants$')
     if variants.IsValid():
-        res = _serialize_enum(value, visited, depth)
+        res = _serialize_enum(value, type_name, visited, depth)
         if res:
             return res
 
     # Also check for explicit variant in type name (e.g., Status::Active, Option::Some)
     # OR if it's a C-style enum (has summary but no variants)
-    if '::' in type_name:
-        parts = type_name.split('::')
-        last_part = parts[-1] if parts else ""
-        # Skip standard library types we handle elsewhere
-        if last_part and last_part[0].isupper():
-            known_std = ['Vec', 'Option', 'Result', 'Arc', 'Rc', 'Box', 'String',
-                        'HashMap', 'RefCell', 'Cell', 'Mutex', 'RwLock']
-            if not any(k in type_name for k in known_std):
-                # Heuristic: if it has lowercase child names, it's likely a struct, not an enum
-                is_struct = False
-                num_children = value.GetNumChildren()
-                if num_children > 0:
-                    for i in range(min(num_children, 5)): # Check first few children
-                        child = value.GetChildAtIndex(i)
-                        name = child.GetName() or ""
-                        if name and name[0].islower() and not name.startswith('$'):
-                            is_struct = True
-                            break
-
-                if not is_struct:
-                    res = _serialize_enum(value, visited, depth)
-                    if res:
-                        return res
+    if _may_be_variant_type(type_name):
+        # Heuristic: if it has lowercase child names, it's likely a struct, not an enum
+        is_struct = False
+        num_children = value.GetNumChildren()
+        if num_children > 0:
+            for i in range(min(num_children, 5)): # Check first few children
+                child = value.GetChildAtIndex(i)
+                name = child.GetName() or ""
+                if name and name[0].islower() and not name.startswith('$'):
+                    is_struct = True
+                    break
+
+        if not is_struct:
+            res = _serialize_enum(value, type_name, visited, depth)
+            if res:
+                return res
 
     # Default: serialize as struct
     return _serialize_struct(value, visited, depth)
 
 
-def _serialize_primitive(value) -> Any:
-    """Serialize a primitive type."""
-    type_name = value.GetType().GetName()
+# Std types that are never treated as enum variants
+_KNOWN_STD_RE = re.compile(
+    'Vec|Option|Result|Arc|Rc|Box|String|HashMap|RefCell|Cell|Mutex|RwLock')
+
+
+@functools.lru_cache(maxsize=4096)
+def _may_be_variant_type(type_name: str) -> bool:
+    """
+    Check if a type name looks like an explicit enum variant (Status::Active).
+
+    Standard library types we handle elsewhere are excluded.
+    """
+    if '::' not in type_name:
+        return False
+    last_part = type_name.rpartition('::')[2]
+    if not last_part or not last_part[0].isupper():
+        return False
+    return _KNOWN_STD_RE.search(type_name) is None
+
+
+# Std type markers, checked in this order of precedence (first wins)
+_KIND_PRECEDENCE = {
+    'alloc::string::String': 0,
+    'Vec<': 1,
+    'Option<': 2,
+    'Result<': 3,
+    'HashMap<': 4,
+    'Box<': 5,
+    'Arc<': 5,
+    'Rc<': 5,
+}
+_KIND_RE = re.compile('|'.join(re.escape(m) for m in _KIND_PRECEDENCE))
+_KIND_NAMES = ['string', 'vec', 'option', 'result', 'hashmap', 'smart_pointer']
+
+
+@functools.lru_cache(maxsize=4096)
+def _classify_type(type_name: str) -> Optional[str]:
+    """
+    Classify a raw LLDB type name into a _KIND_HANDLERS key, or None.
 
+    A type name may mention several std types (Option<Vec<T>>); the marker
+    with the highest precedence decides, in one regex scan.
+    """
+    if type_name == '&str':
+        return 'str_ref'
+    ranks = [_KIND_PRECEDENCE[m] for m in _KIND_RE.findall(type_name)]
+    if not ranks:
+        return None
+    return _KIND_NAMES[min(ranks)]
+
+
+# Markers of heap pointer types, anywhere in the name (Vec<Arc<T>> included)
+_POINTER_RE = re.compile(r'Arc<|Rc<|Box<|\*const|\*mut')
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_pointer_type(type_name: str) -> bool:
+    """Whether value_to_json should track the value's address for cycles."""
+    return _POINTER_RE.search(type_name) is not None
+
+
+def _serialize_primitive(value, type_name: str) -> Any:
+    """Serialize a primitive type."""
     # Try to get the value directly
     val_str = value.GetValue()
     if val_str is None:
         return None
 
-    # Parse based on type
-    if type_name in ('bool', '_Bool'):
-        return val_str.lower() == 'true'
-    elif type_name == 'char':
-        # Remove quotes if present
-        return val_str.strip("'")
-    elif type_name in ('f32', 'f64', 'float', 'double'):
-        return float(val_str)
-    else:
-        # Integer types - try to parse
+    # Parse based on type; anything else is parsed as an integer
+    return _PRIMITIVE_PARSERS.get(type_name, _parse_int)(val_str)
+
+
+def _parse_bool(val_str: str) -> bool:
+    return val_str.lower() == 'true'
+
+
+def _parse_char(val_str: str) -> str:
+    # Remove quotes if present
+    return val_str.strip("'")
+
+
+def _parse_int(val_str: str) -> Any:
+    # Integer types - try to parse
+    try:
+        return int(val_str, 0)  # 0 allows hex/octal
+    except ValueError:
+        # Maybe it's a float in disguise
         try:
-            return int(val_str, 0)  # 0 allows hex/octal
-        except ValueError:
-            # Maybe it's a float in disguise
-            try:
-                return float(val_str)
-            except Exception:
-                return val_str
+            return float(val_str)
+        except Exception:
+            return val_str
+
+
+# Primitive type name -> value string parser (default: _parse_int)
+_PRIMITIVE_PARSERS = {
+    'bool': _parse_bool,
+    '_Bool': _parse_bool,
+    'char': _parse_char,
+    'f32': float,
+    'f64': float,
+    'float': float,
+    'double': float,
+}
+
+
+# Per-thread SBError reused across process.ReadMemory() calls
+_SB_ERROR_LOCAL = threading.local()
+
+
+def _sb_error():
+    """Return this thread's reusable SBError, cleared."""
+    error = getattr(_SB_ERROR_LOCAL, 'error', None)
+    if error is None:
+        error = _SB_ERROR_LOCAL.error = lldb.SBError()
+    else:
+        error.Clear()
+    return error
+
+
+def _byte_order(process) -> str:
+    """struct byte-order prefix for the target's memory."""
+    return '>' if process.GetByteOrder() == lldb.eByteOrderBig else '<'
+
 
+# String header { ptr, cap, len } on 64-bit targets, read as raw memory in
+# the target's byte order. rustc does not fix the field order (newer
+# toolchains put cap first), so the word holding each field is learned per
+# type from the debug info.
+_STRING_HEADERS = {order: struct.Struct(order + 'QQQ') for order in '<>'}
+_STRING_HEADER_SIZE = 24
 
+# String type name -> (ptr word, len word) in its header, once learned for
+# the current process
+_STRING_LAYOUT_CACHE: Dict[str, Tuple[int, int]] = _layout_cache.new_cache()
 
-def _serialize_string(value) -> str:
+_INVALID_ADDRESS = 0xFFFFFFFFFFFFFFFF  # LLDB_INVALID_ADDRESS
+
+
+def _serialize_string(value, type_name: str) -> str:
     """Serialize a Rust String.
 
     String layout: { vec: Vec<u8> { buf: RawVec { ptr, cap }, len } }
     We try GetSummary first, then fall back to direct memory reading.
+    Once a String type's field offsets are known, its header is read with
+    a single ReadMemory instead of walking the child values.
     """
     # Try LLDB summary first (most reliable when it works)
     summary = value.GetSummary()
@@ -491,6 +671,16 @@ def _serialize_string(value) -> str:
     if not process or not process.IsValid():
         return ""
 
+    # Fast path: one read of the whole header at the learned offsets
+    addr = value.GetLoadAddress()
+    layout = _STRING_LAYOUT_CACHE.get(type_name)
+    if layout is not None and addr != _INVALID_ADDRESS:
+        error = _sb_error()
+        data = process.ReadMemory(addr, _STRING_HEADER_SIZE, error)
+        if not error.Fail() and len(data) == _STRING_HEADER_SIZE:
+            words = _STRING_HEADERS[_byte_order(process)].unpack(data)
+            return _read_string_data(process, words[layout[0]], words[layout[1]])
+
     # Get the Vec<u8> inside String
     vec = value.GetChildMemberWithName('vec')
     if not vec.IsValid():
@@ -515,15 +705,16 @@ def _serialize_string(value) -> str:
 
     # Try multiple paths to get the data pointer
     ptr_addr = None
+    ptr_value = None
 
     # Path 1: Try the original _find_pointer_in_buf method
     buf = vec.GetChildMemberWithName('buf')
     if buf.IsValid():
         try:
-            from .providers import _find_pointer_in_buf
             ptr = _find_pointer_in_buf(buf)
             if ptr and ptr.IsValid():
                 ptr_addr = ptr.GetValueAsUnsigned()
+                ptr_value = ptr
         except Exception:
             pass
 
@@ -544,39 +735,52 @@ def _serialize_string(value) -> str:
                     node = None
                     break
             if node and node.IsValid():
-                addr = node.GetValueAsUnsigned()
-                if addr and addr > 0x1000:  # Valid address check
-                    ptr_addr = addr
+                addr_value = node.GetValueAsUnsigned()
+                if addr_value and addr_value > 0x1000:  # Valid address check
+                    ptr_addr = addr_value
+                    ptr_value = node
                     break
 
-    # Path 3: Try first child of buf as pointer
-    if not ptr_addr and buf and buf.IsValid():
-        for i in range(min(buf.GetNumChildren(), 5)):
-            child = buf.GetChildAtIndex(i)
-            if child.IsValid():
-                addr = child.GetValueAsUnsigned()
-                if addr and addr > 0x1000:
-                    ptr_addr = addr
-                    break
+    if ptr_addr and addr != _INVALID_ADDRESS:
+        _learn_string_layout(type_name, addr, ptr_value, len_child)
 
-    # Path 4: Read raw memory at String's address
-    # String in memory: starts with ptr (8 bytes on 64-bit)
-    if not ptr_addr:
-        addr = value.GetLoadAddress()
-        if addr != 0xFFFFFFFFFFFFFFFF:  # LLDB_INVALID_ADDRESS
-            try:
-                import struct
-                error = lldb.SBError()
-                # Read 24 bytes (ptr + cap + len on 64-bit)
-                data = process.ReadMemory(addr, 24, error)
-                if not error.Fail() and len(data) >= 8:
-                    ptr_addr = struct.unpack('Q', data[:8])[0]  # First 8 bytes is ptr
-            except Exception:
-                pass
+    # Path 3: Read the raw header at String's address
+    # Older toolchains lay String out as { ptr, cap, len }
+    if not ptr_addr and addr != _INVALID_ADDRESS:
+        try:
+            error = _sb_error()
+            data = process.ReadMemory(addr, _STRING_HEADER_SIZE, error)
+            if not error.Fail() and len(data) >= _STRING_HEADER_SIZE:
+                ptr_addr = _STRING_HEADERS[_byte_order(process)].unpack_from(data)[0]
+        except Exception:
+            pass
 
     # Now read the actual string data
+    return _read_string_data(process, ptr_addr, length)
+
+
+def _learn_string_layout(type_name: str, addr: int, ptr_value, len_child):
+    """Record which header words hold a String type's ptr and len."""
+    words = []
+    for field in (ptr_value, len_child):
+        offset = field.GetLoadAddress() - addr
+        if offset not in (0, 8, 16) or field.GetByteSize() != 8:
+            return
+        words.append(offset // 8)
+    if words[0] != words[1]:
+        _STRING_LAYOUT_CACHE[type_name] = (words[0], words[1])
+
+
+def _read_string_data(process, ptr_addr: int, length: int) -> str:
+    """Decode a String's bytes given its data pointer and length."""
+    if length == 0:
+        return ""
+
+    if length > 10000:  # Sanity check
+        return f"<String len={length}>"
+
     if ptr_addr:
-        error = lldb.SBError()
+        error = _sb_error()
         data = process.ReadMemory(ptr_addr, min(length, 4096), error)
         if not error.Fail():
             return data.decode('utf-8', errors='replace')
@@ -584,6 +788,10 @@ def _serialize_string(value) -> str:
     return f"<String len={length}>"
 
 
+# &str fat pointer on 64-bit targets: (data_ptr, length)
+_FAT_PTR = struct.Struct('QQ')
+
+
 def _serialize_str_ref(value) -> str:
     """Serialize a &str reference.
 
@@ -600,7 +808,22 @@ def _serialize_str_ref(value) -> str:
     if not process or not process.IsValid():
         return "<&str>"
 
-    # Pattern 1: Try direct children (index 0 = ptr, index 1 = len)
+    # Pattern 1: The fat pointer's own bytes are already in the value's data;
+    # unpacking them saves the two child lookups below
+    data = value.GetData()
+    if data.GetByteSize() == _FAT_PTR.size:
+        error = _sb_error()
+        ptr_addr = data.GetUnsignedInt64(error, 0)
+        str_len = data.GetUnsignedInt64(error, 8)
+        # Empty string: nothing to read, and no need for the fallbacks below
+        if not error.Fail() and str_len == 0:
+            return ""
+        if not error.Fail() and ptr_addr and str_len and str_len < 10000:
+            str_data = process.ReadMemory(ptr_addr, min(str_len, 4096), error)
+            if not error.Fail():
+                return str_data.decode('utf-8', errors='replace')
+
+    # Pattern 2: Try direct children (index 0 = ptr, index 1 = len)
     if value.GetNumChildren() >= 2:
         ptr_child = value.GetChildAtIndex(0)
         len_child = value.GetChildAtIndex(1)
@@ -608,34 +831,33 @@ def _serialize_str_ref(value) -> str:
             ptr_addr = ptr_child.GetValueAsUnsigned()
             str_len = len_child.GetValueAsUnsigned()
             if ptr_addr and str_len and str_len < 10000:  # Sanity check
-                error = lldb.SBError()
+                error = _sb_error()
                 data = process.ReadMemory(ptr_addr, min(str_len, 4096), error)
                 if not error.Fail():
                     return data.decode('utf-8', errors='replace')
 
-    # Pattern 2: Try named children (data_ptr, length)
+    # Pattern 3: Try named children (data_ptr, length)
     data_ptr = value.GetChildMemberWithName('data_ptr')
     length = value.GetChildMemberWithName('length')
     if data_ptr.IsValid() and length.IsValid():
         ptr_addr = data_ptr.GetValueAsUnsigned()
         str_len = length.GetValueAsUnsigned()
         if ptr_addr and str_len and str_len < 10000:
-            error = lldb.SBError()
+            error = _sb_error()
             data = process.ReadMemory(ptr_addr, min(str_len, 4096), error)
             if not error.Fail():
                 return data.decode('utf-8', errors='replace')
 
-    # Pattern 3: Read raw memory at value's address
+    # Pattern 4: Read raw memory at value's address
     # &str in memory on 64-bit: [ptr: 8 bytes][len: 8 bytes]
     addr = value.GetLoadAddress()
-    if addr != 0xFFFFFFFFFFFFFFFF:  # LLDB_INVALID_ADDRESS
+    if addr != _INVALID_ADDRESS:
         try:
-            import struct
-            error = lldb.SBError()
+            error = _sb_error()
             # Read 16 bytes (ptr + len on 64-bit)
             data = process.ReadMemory(addr, 16, error)
             if not error.Fail() and len(data) == 16:
-                ptr_addr, str_len = struct.unpack('QQ', data)  # Two 64-bit values
+                ptr_addr, str_len = _FAT_PTR.unpack(data)  # Two 64-bit values
                 if ptr_addr and str_len and str_len < 10000:  # Sanity check
                     str_data = process.ReadMemory(ptr_addr, min(str_len, 4096), error)
                     if not error.Fail():
@@ -646,9 +868,32 @@ def _serialize_str_ref(value) -> str:
     return "<&str>"
 
 
-def _serialize_vec(value, visited: Set[int], depth: int = 0) -> List[Any]:
+# (type name, field name) -> child index, or None if the type has no such
+# field; valid for the current process only
+_MEMBER_INDEX_CACHE: Dict[tuple, Optional[int]] = _layout_cache.new_cache()
+
+
+def _child_member(value, type_name: str, field_name: str):
+    """
+    GetChildMemberWithName(), with the field's child index resolved once per type.
+
+    Later values of the same type are accessed with GetChildAtIndex only.
+    """
+    key = (type_name, field_name)
+    index = _MEMBER_INDEX_CACHE.get(key, -1)
+    if index == -1:
+        index = value.GetIndexOfChildWithName(field_name)
+        if index >= value.GetNumChildren():
+            index = None
+        _MEMBER_INDEX_CACHE[key] = index
+    if index is None:
+        return value.GetChildMemberWithName(field_name)
+    return value.GetChildAtIndex(index)
+
+
+def _serialize_vec(value, type_name: str, visited: Set[int], depth: int = 0) -> List[Any]:
     """Serialize a Vec<T>."""
-    len_child = value.GetChildMemberWithName('len')
+    len_child = _child_member(value, type_name, 'len')
     if not len_child.IsValid():
         return []
 
@@ -662,15 +907,15 @@ def _serialize_vec(value, visited: Set[int], depth: int = 0) -> List[Any]:
     if not elem_type.IsValid():
         return [f"<{length} elements>"]
 
+    elem_type_name = elem_type.GetName()
     elem_size = elem_type.GetByteSize()
 
     # Get data pointer
-    buf = value.GetChildMemberWithName('buf')
+    buf = _child_member(value, type_name, 'buf')
     if not buf.IsValid():
         return [f"<{length} elements>"]
 
     try:
-        from .providers import _find_pointer_in_buf
         ptr = _find_pointer_in_buf(buf)
         if not ptr or not ptr.IsValid():
             return [f"<{length} elements>"]
@@ -680,13 +925,26 @@ def _serialize_vec(value, visited: Set[int], depth: int = 0) -> List[Any]:
             return []
 
         # Serialize elements (limit to 100 for performance)
-        elements = []
         max_elements = min(length, 100)
 
-        for i in range(max_elements):
-            addr = ptr_addr + i * elem_size
-            elem = value.CreateValueFromAddress(f"[{i}]", addr, elem_type)
-            elements.append(value_to_json(elem, visited, depth+1))
+        # Integer/bool elements: a single memory read for the whole slice
+        elements = None
+        if depth < 20:
+            elements = _read_primitive_elements(
+                value.GetProcess(), ptr_addr, elem_type_name, elem_size, max_elements)
+
+        if elements is None:
+            elements = []
+            create_value = value.CreateValueFromAddress
+            child_depth = depth + 1
+            for i in range(max_elements):
+                addr = ptr_addr + i * elem_size
+                elem = create_value(f"[{i}]", addr, elem_type)
+                if child_depth > 20 or not elem.IsValid():
+                    elements.append(value_to_json(elem, visited, child_depth))
+                else:
+                    # Every element has the Vec's element type; skip asking LLDB for it
+                    elements.append(_typed_value_to_json(elem, elem_type_name, visited, child_depth))
 
         if length > max_elements:
             elements.append(f"... ({length - max_elements} more)")
@@ -696,12 +954,45 @@ def _serialize_vec(value, visited: Set[int], depth: int = 0) -> List[Any]:
         return [f"<{length} elements>"]
 
 
-def _serialize_option(value, visited: Set[int], depth: int = 0) -> Optional[Any]:
+def _read_primitive_elements(process, ptr_addr: int, elem_type_name: str,
+                             elem_size: int, count: int) -> Optional[List[Any]]:
+    """
+    Read `count` integer or bool elements starting at ptr_addr in one go.
+
+    Returns None when the element type isn't covered or the read fails, in
+    which case the caller serializes element by element. Floats are left to
+    that path so values keep LLDB's formatting.
+    """
+    signed = _INT_SIGNEDNESS.get(elem_type_name)
+    if signed is None or elem_size not in _INT_FORMATS or not process:
+        return None
+
+    error = _sb_error()
+    data = process.ReadMemory(ptr_addr, count * elem_size, error)
+    if error.Fail() or not data or len(data) != count * elem_size:
+        return None
+
+    # Single-byte elements need no decoding: bytes already iterate as u8.
+    # Vec<u8> stays a plain int list rather than an encoded blob: the REPL
+    # side rebuilds values with serde_json, including Vec<u8> fields nested
+    # in user structs, and that expects a JSON array.
+    if elem_type_name in ('bool', '_Bool'):
+        return [b != 0 for b in data]
+    if elem_size == 1 and not signed:
+        return list(data)
+
+    code = _INT_FORMATS[elem_size]
+    return list(struct.unpack(f"{_byte_order(process)}{count}{code if signed else code.upper()}", data))
+
+
+def _serialize_option(value, type_name: str, visited: Set[int], depth: int = 0) -> Optional[Any]:
     """Serialize an Option<T> with __ferrumpy_kind__ metadata."""
-    type_name = value.GetType().GetName()
+    _, sep, variant = type_name.rpartition('::')
+    if not sep:
+        variant = None
 
     # Check for explicit None variant in type name
-    if type_name.endswith('::None'):
+    if variant == 'None':
         return {
             "__ferrumpy_kind__": "option",
             "__variant__": "None",
@@ -709,7 +1000,7 @@ def _serialize_option(value, visited: Set[int], depth: int = 0) -> Optional[Any]
         }
 
     # Check for explicit Some variant in type name
-    if type_name.endswith('::Some'):
+    if variant == 'Some':
         inner = value.GetChildAtIndex(0)
         inner_value = value_to_json(inner, visited, depth+1) if inner.IsValid() else None
         return {
@@ -794,25 +1085,15 @@ def _serialize_option(value, visited: Set[int], depth: int = 0) -> Optional[Any]
         "__summary__": summary or ""
     }
 
-def _serialize_result(value, visited: Set[int], depth: int = 0) -> Dict[str, Any]:
+def _serialize_result(value, type_name: str, visited: Set[int], depth: int = 0) -> Dict[str, Any]:
     """Serialize a Result<T, E> with __ferrumpy_kind__ metadata."""
-    type_name = value.GetType().GetName()
-
-    if type_name.endswith('::Ok'):
+    _, sep, variant = type_name.rpartition('::')
+    if sep and (variant == 'Ok' or variant == 'Err'):
         inner = value.GetChildAtIndex(0)
         inner_value = value_to_json(inner, visited, depth+1) if inner.IsValid() else None
         return {
             "__ferrumpy_kind__": "result",
-            "__variant__": "Ok",
-            "__inner__": inner_value
-        }
-
-    if type_name.endswith('::Err'):
-        inner = value.GetChildAtIndex(0)
-        inner_value = value_to_json(inner, visited, depth+1) if inner.IsValid() else None
-        return {
-            "__ferrumpy_kind__": "result",
-            "__variant__": "Err",
+            "__variant__": variant,
             "__inner__": inner_value
         }
 
@@ -839,10 +1120,8 @@ def _serialize_result(value, visited: Set[int], depth: int = 0) -> Dict[str, Any
     }
 
 
-def _serialize_smart_pointer(value, visited: Set[int], depth: int = 0) -> Any:
+def _serialize_smart_pointer(value, type_name: str, visited: Set[int], depth: int = 0) -> Any:
     """Serialize Box/Arc/Rc with __ferrumpy_kind__ metadata."""
-    type_name = value.GetType().GetName()
-
     # Determine pointer kind
     if 'Arc<' in type_name:
         kind = "arc"
@@ -919,24 +1198,25 @@ def _serialize_smart_pointer(value, visited: Set[int], depth: int = 0) -> Any:
     }
 
 
-def _serialize_hashmap(value, visited: Set[int], depth: int = 0) -> Dict[str, Any]:
+# The {...} body of an LLDB HashMap summary
+_MAP_BODY_RE = re.compile(r'\{[^}]*\}')
+
+
+def _serialize_hashmap(value, type_name: str, visited: Set[int], depth: int = 0) -> Dict[str, Any]:
     """Serialize a HashMap using LLDB's GetSummary() which formats key-value pairs.
 
     LLDB's summary for HashMap typically looks like: '{"key1": value1, "key2": value2}'
     We try to parse this, falling back to a structured representation if parsing fails.
     """
-    type_name = value.GetType().GetName()
-
     # Try LLDB summary first - this often gives us formatted HashMap contents
     summary = value.GetSummary()
     if summary:
         # Try to parse the summary as JSON-like data
         # LLDB summary format: size=N { "key1": value1, "key2": value2 }
         # Or sometimes just: { "key1": value1, ... }
-        import re
 
         # Extract the {...} part
-        brace_match = re.search(r'\{[^}]*\}', summary)
+        brace_match = _MAP_BODY_RE.search(summary)
         if brace_match:
             try:
                 # Try to parse as JSON object
@@ -985,10 +1265,9 @@ def _serialize_hashmap(value, visited: Set[int], depth: int = 0) -> Dict[str, An
         "__error__": "Could not extract HashMap contents"
     }
 
-def _serialize_tuple(value, visited: Set[int], depth: int = 0) -> Dict[str, Any]:
+def _serialize_tuple(value, type_name: str, visited: Set[int], depth: int = 0) -> Dict[str, Any]:
     """Serialize a tuple with __ferrumpy_kind__ metadata."""
     elements = []
-    type_name = value.GetType().GetName()
 
     num_children = value.GetNumChildren()
     for i in range(num_children):
@@ -1005,18 +1284,28 @@ def _serialize_tuple(value, visited: Set[int], depth: int = 0) -> Dict[str, Any]
     }
 
 
-def _serialize_fixed_array(value, visited: Set[int], depth: int = 0) -> Dict[str, Any]:
+def _serialize_fixed_array(value, type_name: str, visited: Set[int], depth: int = 0) -> Dict[str, Any]:
     """Serialize a fixed-size array with __ferrumpy_kind__ metadata."""
     elements = []
-    type_name = value.GetType().GetName()
+
+    # Elements of a real array ([T; N] or C-style T[N]) share one type, so
+    # its name is looked up once. Anything else routed here (slices such as
+    # &[T], generics such as Foo<[u8; 4]>) has mixed child types.
+    uniform = type_name[:1] == '[' or _ARRAY_RE.match(type_name) is not None
+    elem_type_name = None
+    child_depth = depth + 1
 
     num_children = value.GetNumChildren()
     for i in range(min(num_children, 100)):  # Limit for performance
         child = value.GetChildAtIndex(i)
-        if child.IsValid():
-            elements.append(value_to_json(child, visited, depth+1))
-        else:
+        if not child.IsValid():
             elements.append(None)
+        elif child_depth > 20:
+            elements.append(value_to_json(child, visited, child_depth))
+        else:
+            if elem_type_name is None or not uniform:
+                elem_type_name = child.GetType().GetName()
+            elements.append(_typed_value_to_json(child, elem_type_name, visited, child_depth))
 
     return {
         "__ferrumpy_kind__": "array",
@@ -1026,7 +1315,7 @@ def _serialize_fixed_array(value, visited: Set[int], depth: int = 0) -> Dict[str
     }
 
 
-def _serialize_enum(value, visited: Set[int], depth: int = 0) -> Optional[Dict[str, Any]]:
+def _serialize_enum(value, type_name: str, visited: Set[int], depth: int = 0) -> Optional[Dict[str, Any]]:
     """Serialize a user-defined enum with __ferrumpy_kind__: enum metadata.
 
     LLDB represents Rust enums with a $variants$ child containing:
@@ -1036,8 +1325,6 @@ def _serialize_enum(value, visited: Set[int], depth: int = 0) -> Optional[Dict[s
 
     Returns None if the value doesn't appear to be an enum.
     """
-    type_name = value.GetType().GetName()
-
     # Extract base enum type from type name
     # e.g., "rust_sample::types::Status" -> "Status"
     parts = type_name.split('::')
@@ -1165,10 +1452,12 @@ def _serialize_enum(value, visited: Set[int], depth: int = 0) -> Optional[Dict[s
 def _serialize_struct(value, visited: Set[int], depth: int = 0) -> Dict[str, Any]:
     """Serialize a struct as a dictionary of fields."""
     result = {}
+    child_depth = depth + 1
 
     num_children = value.GetNumChildren()
+    get_child = value.GetChildAtIndex
     for i in range(min(num_children, 50)):  # Limit fields
-        child = value.GetChildAtIndex(i)
+        child = get_child(i)
         if not child.IsValid():
             continue
 
@@ -1177,11 +1466,16 @@ def _serialize_struct(value, visited: Set[int], depth: int = 0) -> Dict[str, Any
             name = f"_{i}"
 
         # Skip internal fields
-        if name.startswith('$'):
+        if name[:1] == '$':
+            continue
+
+        if child_depth > 20:
+            result[name] = {"__truncated__": "max depth"}
             continue
 
         try:
-            result[name] = value_to_json(child, visited, depth+1)
+            result[name] = _typed_value_to_json(
+                child, child.GetType().GetName(), visited, child_depth)
         except Exception as e:
             result[name] = {"__error__": str(e)}
 
@@ -1191,9 +1485,21 @@ def _serialize_struct(value, visited: Set[int], depth: int = 0) -> Dict[str, Any
     return result
 
 
+# Kind (from _classify_type) -> serializer, called as (value, type_name, visited, depth)
+_KIND_HANDLERS = {
+    'string': lambda value, type_name, visited, depth: _serialize_string(value, type_name),
+    'str_ref': lambda value, type_name, visited, depth: _serialize_str_ref(value),
+    'vec': _serialize_vec,
+    'option': _serialize_option,
+    'result': _serialize_result,
+    'hashmap': _serialize_hashmap,
+    'smart_pointer': _serialize_smart_pointer,
+}
+
+
 def to_json_string(data: Any, indent: int = 2) -> str:
     """Convert serialized data to JSON string."""
-    return json.dumps(data, indent=indent, ensure_ascii=False, default=str)
+    return _json.dumps_text(data, indent)
 
 
 # For testing
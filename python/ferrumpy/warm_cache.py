@@ -36,12 +36,13 @@ def warm_cache():
         print("[FerrumPy] Creating REPL session...")
         session = ferrumpy_core.PyReplSession()
 
-        # Add serde dependencies (these are cached after first compile)
-        print("[FerrumPy] Compiling serde...")
-        session.eval(':dep serde = { version = "1", features = ["derive"] }')
-
-        print("[FerrumPy] Compiling serde_json...")
-        session.eval(':dep serde_json = "1"')
+        # Add serde dependencies (these are cached after first compile).
+        # Both go in one eval so cargo schedules their builds together.
+        print("[FerrumPy] Compiling serde and serde_json...")
+        session.eval(
+            ':dep serde = { version = "1", features = ["derive"] }\n'
+            ':dep serde_json = "1"'
+        )
 
         # Verify they work
         print("[FerrumPy] Verifying compilation...")
@@ -16,8 +16,10 @@ echo "FerrumPy Test Suite"
 echo "=============================================="
 echo
 
-# Build rust_sample if needed
-if [ ! -f "$RUST_SAMPLE_DIR/target/debug/rust_sample" ]; then
+# Build rust_sample if missing or older than its sources
+RUST_SAMPLE_BIN="$RUST_SAMPLE_DIR/target/debug/rust_sample"
+if [ ! -f "$RUST_SAMPLE_BIN" ] || \
+   [ -n "$(find "$RUST_SAMPLE_DIR/src" "$RUST_SAMPLE_DIR/Cargo.toml" -newer "$RUST_SAMPLE_BIN" -print -quit)" ]; then
     echo "Building rust_sample..."
     (cd "$RUST_SAMPLE_DIR" && cargo build --quiet)
     echo "Built rust_sample"
@@ -41,7 +43,19 @@ run_python_tests() {
     echo
     
     echo "--- Type Normalization Tests ---"
-    python3 "$PROJECT_ROOT/tests/test_type_normalization.py"
+    python3 "$PROJECT_ROOT/tests/test_type_normalization.py" || return 1
+    
+    echo
+    echo "--- Serializer Tests ---"
+    python3 "$PROJECT_ROOT/tests/test_serializer.py" || return 1
+    
+    echo
+    echo "--- Path Resolver Tests ---"
+    python3 "$PROJECT_ROOT/tests/test_path_resolver.py" || return 1
+    
+    echo
+    echo "--- REPL Init Tests ---"
+    python3 "$PROJECT_ROOT/tests/test_repl_init.py"
     
     return $?
 }
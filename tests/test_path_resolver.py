@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Unit tests for FerrumPy path tokenization.
+
+Run with: python -m pytest tests/test_path_resolver.py -v
+Or: python tests/test_path_resolver.py
+"""
+
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from python.ferrumpy.path_resolver import (
+    DerefSegment,
+    IdentSegment,
+    IndexSegment,
+    PathResolutionError,
+    tokenize_path,
+)
+
+
+def _error_for(path):
+    """Return the PathResolutionError message for an invalid path."""
+    try:
+        tokenize_path(path)
+    except PathResolutionError as e:
+        return str(e)
+    raise AssertionError(f"{path!r} should not tokenize")
+
+
+class TestTokenizePath:
+    """Test splitting path expressions into segments."""
+
+    def test_single_identifier(self):
+        assert tokenize_path('user') == [IdentSegment('user')]
+
+    def test_field_and_index(self):
+        assert tokenize_path('users[0].name') == [
+            IdentSegment('users'), IndexSegment(0), IdentSegment('name')]
+
+    def test_nested_index(self):
+        assert tokenize_path('matrix[1][2]') == [
+            IdentSegment('matrix'), IndexSegment(1), IndexSegment(2)]
+
+    def test_tuple_field(self):
+        # LLDB names tuple fields __0, __1, ...
+        assert tokenize_path('pair.1') == [IdentSegment('pair'), IdentSegment('__1')]
+
+    def test_deref(self):
+        assert tokenize_path('box_val.*.x') == [
+            IdentSegment('box_val'), DerefSegment(), IdentSegment('x')]
+
+    def test_surrounding_whitespace(self):
+        assert tokenize_path('  user.name  ') == [IdentSegment('user'), IdentSegment('name')]
+
+
+class TestTokenizePathErrors:
+    """Test error messages for malformed paths."""
+
+    def test_missing_identifier(self):
+        assert _error_for('') == "Invalid path: expected identifier at start of ''"
+        assert _error_for('1a') == "Invalid path: expected identifier at start of '1a'"
+
+    def test_invalid_field_access(self):
+        assert _error_for('a.') == "Invalid field access at: ."
+        assert _error_for('a..b') == "Invalid field access at: ..b"
+
+    def test_invalid_index_access(self):
+        assert _error_for('a[x]') == "Invalid index access at: [x]"
+        assert _error_for('a[1') == "Invalid index access at: [1"
+
+    def test_unexpected_character(self):
+        assert _error_for('a!') == "Unexpected character at: !"
+        assert _error_for('a.0b') == "Unexpected character at: b"
+
+
+def run_tests():
+    """Run all tests and report results."""
+    import traceback
+
+    test_classes = [
+        TestTokenizePath,
+        TestTokenizePathErrors,
+    ]
+
+    total_passed = 0
+    total_failed = 0
+    failures = []
+
+    for test_class in test_classes:
+        instance = test_class()
+        class_name = test_class.__name__
+
+        for method_name in dir(instance):
+            if method_name.startswith('test_'):
+                try:
+                    getattr(instance, method_name)()
+                    print(f"  ✓ {class_name}.{method_name}")
+                    total_passed += 1
+                except AssertionError as e:
+                    print(f"  ✗ {class_name}.{method_name}")
+                    failures.append((f"{class_name}.{method_name}", str(e), traceback.format_exc()))
+                    total_failed += 1
+                except Exception as e:
+                    print(f"  ✗ {class_name}.{method_name} (Exception: {e})")
+                    failures.append((f"{class_name}.{method_name}", str(e), traceback.format_exc()))
+                    total_failed += 1
+
+    print()
+    print(f"Path Resolver Tests: {total_passed}/{total_passed + total_failed} passed")
+
+    if failures:
+        print("\nFailures:")
+        for name, msg, tb in failures:
+            print(f"  {name}: {msg}")
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the evcxr init code generated by FerrumPy's REPL session.
+
+Run with: python -m pytest tests/test_repl_init.py -v
+Or: python tests/test_repl_init.py
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from python.ferrumpy.repl import ReplSession
+
+_FROM_STR = 'let mut __ferrumpy_vars = serde_json::from_str::<serde_json::Value>(r#"'
+
+
+def _make_session(variables, types):
+    """ReplSession with a fixed snapshot and temp dir, without prepare()."""
+    session = ReplSession('.')
+    session.temp_dir = Path('/tmp/ferrumpy_test')
+    session.serialized_data = {'variables': variables, 'types': types}
+    return session
+
+
+class TestInitCode:
+    """Test the generated serde_json init block."""
+
+    VARIABLES = {
+        'count': 5,
+        'name': 'héllo "quoted"',
+        'numbers': [1, 2, 3],
+        'user': {'name': 'Alice', 'age': 30},
+    }
+    TYPES = {
+        'count': 'i32',
+        'name': 'String',
+        'numbers': 'Vec<i32>',
+        'user': 'User',
+    }
+
+    def test_single_from_str(self):
+        code = _make_session(self.VARIABLES, self.TYPES).generate_init_code()
+        assert code.count('serde_json::from_str') == 1
+        assert code.count(_FROM_STR) == 1
+
+    def test_json_round_trips(self):
+        code = _make_session(self.VARIABLES, self.TYPES).generate_init_code()
+        start = code.index(_FROM_STR) + len(_FROM_STR)
+        end = code.index('"#).unwrap();', start)
+        assert json.loads(code[start:end]) == self.VARIABLES
+
+    def test_binding_per_variable(self):
+        code = _make_session(self.VARIABLES, self.TYPES).generate_init_code()
+        lines = code.splitlines()
+        for name, type_name in self.TYPES.items():
+            binding = f'let {name} = __ferrumpy_vars["{name}"].take();'
+            assert binding in lines
+            assert lines[lines.index(binding) - 1] == f'// {name}: {type_name}'
+        # Bindings follow the parse, in snapshot order
+        positions = [code.index(f'let {name} = ') for name in self.VARIABLES]
+        assert code.index(_FROM_STR) < positions[0]
+        assert positions == sorted(positions)
+
+    def test_missing_type_hint(self):
+        code = _make_session({'x': 1}, {}).generate_init_code()
+        assert '// x: auto' in code.splitlines()
+
+    def test_dependencies(self):
+        code = _make_session({}, {}).generate_init_code()
+        assert ':dep serde_json = "1"' in code
+        assert ':dep ferrumpy_snapshot_lib = { path = "/tmp/ferrumpy_test/generated_lib" }' in code
+
+    def test_no_variables(self):
+        code = _make_session({}, {}).generate_init_code()
+        assert 'serde_json::from_str' not in code
+        assert '__ferrumpy_vars' not in code
+
+    def test_utf8_bytes(self):
+        session = _make_session(self.VARIABLES, self.TYPES)
+        assert session._generate_init_bytes().decode('utf-8') == session.generate_init_code()
+
+
+def run_tests():
+    """Run all tests and report results."""
+    import traceback
+
+    test_classes = [
+        TestInitCode,
+    ]
+
+    total_passed = 0
+    total_failed = 0
+    failures = []
+
+    for test_class in test_classes:
+        instance = test_class()
+        class_name = test_class.__name__
+
+        for method_name in dir(instance):
+            if method_name.startswith('test_'):
+                try:
+                    getattr(instance, method_name)()
+                    print(f"  ✓ {class_name}.{method_name}")
+                    total_passed += 1
+                except AssertionError as e:
+                    print(f"  ✗ {class_name}.{method_name}")
+                    failures.append((f"{class_name}.{method_name}", str(e), traceback.format_exc()))
+                    total_failed += 1
+                except Exception as e:
+                    print(f"  ✗ {class_name}.{method_name} (Exception: {e})")
+                    failures.append((f"{class_name}.{method_name}", str(e), traceback.format_exc()))
+                    total_failed += 1
+
+    print()
+    print(f"REPL Init Tests: {total_passed}/{total_passed + total_failed} passed")
+
+    if failures:
+        print("\nFailures:")
+        for name, msg, tb in failures:
+            print(f"  {name}: {msg}")
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
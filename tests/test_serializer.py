@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Unit tests for FerrumPy value serialization.
+
+LLDB values are replaced by small stand-ins that answer the SBValue calls
+the serializer makes, so these run without LLDB.
+
+Run with: python -m pytest tests/test_serializer.py -v
+Or: python tests/test_serializer.py
+"""
+
+import contextlib
+import os
+import struct
+import sys
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from python.ferrumpy import serializer
+from python.ferrumpy.serializer import value_to_json
+
+BIG_ENDIAN = 1  # lldb.eByteOrderBig
+LITTLE_ENDIAN = 4  # lldb.eByteOrderLittle
+
+
+class FakeType:
+    """Stand-in for lldb.SBType."""
+
+    def __init__(self, name):
+        self._name = name
+
+    def GetName(self):
+        return self._name
+
+
+class FakeError:
+    """Stand-in for lldb.SBError."""
+
+    def __init__(self):
+        self._failed = False
+
+    def Fail(self):
+        return self._failed
+
+    def Clear(self):
+        self._failed = False
+
+    def SetErrorString(self, message):
+        self._failed = True
+
+
+class FakeProcess:
+    """Stand-in for lldb.SBProcess over a few mapped memory regions."""
+
+    def __init__(self, regions, byte_order=LITTLE_ENDIAN):
+        self._regions = regions
+        self._byte_order = byte_order
+
+    def IsValid(self):
+        return True
+
+    def GetByteOrder(self):
+        return self._byte_order
+
+    def ReadMemory(self, addr, size, error):
+        for start, data in self._regions.items():
+            if start <= addr and addr + size <= start + len(data):
+                return data[addr - start:addr - start + size]
+        error.SetErrorString('memory read failed')
+        return None
+
+
+class FakeData:
+    """Stand-in for lldb.SBData holding a value's own bytes."""
+
+    def __init__(self, data, byte_order=LITTLE_ENDIAN):
+        self._data = data
+        self._order = '>' if byte_order == BIG_ENDIAN else '<'
+
+    def GetByteSize(self):
+        return len(self._data)
+
+    def GetUnsignedInt64(self, error, offset):
+        return struct.unpack_from(self._order + 'Q', self._data, offset)[0]
+
+
+class FakeValue:
+    """Stand-in for lldb.SBValue with a fixed type, value and children."""
+
+    def __init__(self, type_name, name=None, value=None, children=(), address=0,
+                 process=None, data=b''):
+        self._type = FakeType(type_name)
+        self._name = name
+        self._value = value
+        self._children = list(children)
+        self._address = address
+        self._process = process
+        self._data = data
+
+    def IsValid(self):
+        return True
+
+    def GetType(self):
+        return self._type
+
+    def GetName(self):
+        return self._name
+
+    def GetValue(self):
+        return self._value
+
+    def GetSummary(self):
+        return None
+
+    def GetNumChildren(self):
+        return len(self._children)
+
+    def GetChildAtIndex(self, index):
+        return self._children[index]
+
+    def GetChildMemberWithName(self, name):
+        for child in self._children:
+            if child._name == name:
+                return child
+        return INVALID
+
+    def GetValueAsUnsigned(self):
+        return int(self._value, 0) if self._value else 0
+
+    def GetLoadAddress(self):
+        return self._address
+
+    def GetByteSize(self):
+        return 8
+
+    def GetData(self):
+        return FakeData(self._data)
+
+    def GetProcess(self):
+        return self._process
+
+
+class InvalidValue(FakeValue):
+    """Stand-in for an invalid lldb.SBValue."""
+
+    def IsValid(self):
+        return False
+
+
+INVALID = InvalidValue('')
+
+
+@contextlib.contextmanager
+def fake_lldb():
+    """Give the serializer the few lldb names its memory readers use."""
+    saved = serializer.lldb
+    serializer.lldb = SimpleNamespace(SBError=FakeError, eByteOrderBig=BIG_ENDIAN)
+    serializer._SB_ERROR_LOCAL.error = None
+    try:
+        yield
+    finally:
+        serializer.lldb = saved
+        serializer._SB_ERROR_LOCAL.error = None
+
+
+class TestFixedArrays:
+    """Test serialization of arrays and array-like type names."""
+
+    def test_rust_array(self):
+        array = FakeValue('[i32; 3]', 'array', children=[
+            FakeValue('i32', f'[{i}]', str(i * 10)) for i in range(3)
+        ])
+        result = value_to_json(array)
+        assert result['__ferrumpy_kind__'] == 'array'
+        assert result['__elements__'] == [0, 10, 20]
+        assert result['__length__'] == 3
+
+    def test_c_array(self):
+        array = FakeValue('int[2]', 'array', children=[
+            FakeValue('int', f'[{i}]', str(i + 1)) for i in range(2)
+        ])
+        assert value_to_json(array)['__elements__'] == [1, 2]
+
+    def test_slice_children_keep_their_own_types(self):
+        # &[T] has a pointer child and a usize length child
+        slice_value = FakeValue('&[i32]', 'slice', children=[
+            FakeValue('*const i32', 'data_ptr', '0x1000', address=0x2000),
+            FakeValue('usize', 'length', '3'),
+        ])
+        elements = value_to_json(slice_value)['__elements__']
+        assert elements[1] == 3
+
+    def test_generic_with_array_param(self):
+        value = FakeValue('Foo<[u8; 4]>', 'foo', children=[
+            FakeValue('u8', 'count', '7'),
+            FakeValue('bool', 'flag', 'true'),
+        ])
+        assert value_to_json(value)['__elements__'] == [7, True]
+
+
+class TestReadPrimitiveElements:
+    """Test the single-read decoding of integer and bool Vec elements."""
+
+    def _read(self, data, elem_type_name, elem_size, count, byte_order=LITTLE_ENDIAN):
+        process = FakeProcess({0x1000: data}, byte_order)
+        with fake_lldb():
+            return serializer._read_primitive_elements(
+                process, 0x1000, elem_type_name, elem_size, count)
+
+    def test_signed(self):
+        data = struct.pack('<3i', -1, 2, -3)
+        assert self._read(data, 'i32', 4, 3) == [-1, 2, -3]
+        assert self._read(b'\xff\x01', 'i8', 1, 2) == [-1, 1]
+
+    def test_unsigned(self):
+        data = struct.pack('<2H', 65535, 1)
+        assert self._read(data, 'u16', 2, 2) == [65535, 1]
+        assert self._read(struct.pack('<Q', 2**64 - 1), 'usize', 8, 1) == [2**64 - 1]
+
+    def test_u8(self):
+        assert self._read(b'\x00\x7f\xff', 'u8', 1, 3) == [0, 127, 255]
+
+    def test_bool(self):
+        assert self._read(b'\x00\x01\x02', 'bool', 1, 3) == [False, True, True]
+
+    def test_big_endian(self):
+        data = struct.pack('>2q', -2, 3)
+        assert self._read(data, 'i64', 8, 2, BIG_ENDIAN) == [-2, 3]
+
+    def test_unsupported_width(self):
+        assert self._read(b'\x00' * 6, 'i32', 3, 2) is None
+
+    def test_unsupported_type(self):
+        assert self._read(struct.pack('<d', 1.5), 'f64', 8, 1) is None
+
+    def test_short_read(self):
+        assert self._read(b'\x00' * 4, 'i32', 4, 2) is None
+
+
+class TestClassifyType:
+    """Test which handler a raw LLDB type name is routed to."""
+
+    def test_std_types(self):
+        classify = serializer._classify_type
+        assert classify('alloc::string::String') == 'string'
+        assert classify('alloc::vec::Vec<i32, alloc::alloc::Global>') == 'vec'
+        assert classify('core::option::Option<i32>') == 'option'
+        assert classify('core::result::Result<i32, i32>') == 'result'
+        assert classify('std::collections::hash::map::HashMap<i32, i32>') == 'hashmap'
+        assert classify('alloc::sync::Arc<i32>') == 'smart_pointer'
+        assert classify('&str') == 'str_ref'
+        assert classify('i32') is None
+
+    def test_precedence(self):
+        classify = serializer._classify_type
+        assert classify('core::option::Option<alloc::vec::Vec<i32>>') == 'vec'
+        assert classify('alloc::vec::Vec<alloc::string::String>') == 'string'
+        assert classify('core::result::Result<core::option::Option<i32>, i32>') == 'option'
+        assert classify('alloc::boxed::Box<core::result::Result<i32, i32>>') == 'result'
+
+
+# A cap-first String header at 0x1000 pointing at "hello" at 0x5000
+_STRING_ADDR = 0x1000
+_TEXT_ADDR = 0x5000
+
+
+def _string_value(process, with_children=True):
+    """A String whose ptr and len fields sit in header words 1 and 2."""
+    children = []
+    if with_children:
+        pointer = FakeValue('*const u8', 'pointer', hex(_TEXT_ADDR), address=_STRING_ADDR + 8)
+        buf = FakeValue('RawVec<u8>', 'buf', children=[
+            FakeValue('Unique<u8>', 'ptr', children=[pointer]),
+        ])
+        length = FakeValue('usize', 'len', '5', address=_STRING_ADDR + 16)
+        children = [FakeValue('Vec<u8>', 'vec', children=[buf, length])]
+    return FakeValue('alloc::string::String', 's', children=children,
+                     address=_STRING_ADDR, process=process)
+
+
+class TestStringDecoding:
+    """Test String and &str reads from target memory."""
+
+    def _process(self, byte_order=LITTLE_ENDIAN):
+        order = '>' if byte_order == BIG_ENDIAN else '<'
+        header = struct.pack(order + '3Q', 16, _TEXT_ADDR, 5)
+        return FakeProcess({_STRING_ADDR: header, _TEXT_ADDR: b'hello'}, byte_order)
+
+    def test_string_from_children(self):
+        serializer._STRING_LAYOUT_CACHE.clear()
+        process = self._process()
+        with fake_lldb():
+            assert serializer._serialize_string(
+                _string_value(process), 'alloc::string::String') == 'hello'
+        assert serializer._STRING_LAYOUT_CACHE['alloc::string::String'] == (1, 2)
+
+    def test_learned_header(self):
+        # Once the layout is learned, the header alone is enough
+        serializer._STRING_LAYOUT_CACHE.clear()
+        process = self._process()
+        with fake_lldb():
+            serializer._serialize_string(_string_value(process), 'alloc::string::String')
+            assert serializer._serialize_string(
+                _string_value(process, with_children=False), 'alloc::string::String') == 'hello'
+        serializer._STRING_LAYOUT_CACHE.clear()
+
+    def test_learned_header_big_endian(self):
+        serializer._STRING_LAYOUT_CACHE.clear()
+        serializer._STRING_LAYOUT_CACHE['alloc::string::String'] = (1, 2)
+        process = self._process(BIG_ENDIAN)
+        with fake_lldb():
+            assert serializer._serialize_string(
+                _string_value(process, with_children=False), 'alloc::string::String') == 'hello'
+        serializer._STRING_LAYOUT_CACHE.clear()
+
+    def test_str_fat_pointer(self):
+        process = FakeProcess({_TEXT_ADDR: b'hello'})
+        value = FakeValue('&str', 's', process=process,
+                          data=struct.pack('<2Q', _TEXT_ADDR, 5))
+        with fake_lldb():
+            assert serializer._serialize_str_ref(value) == 'hello'
+
+    def test_empty_str(self):
+        value = FakeValue('&str', 's', process=FakeProcess({}),
+                          data=struct.pack('<2Q', 0, 0))
+        with fake_lldb():
+            assert serializer._serialize_str_ref(value) == ''
+
+
+def run_tests():
+    """Run all tests and report results."""
+    import traceback
+
+    test_classes = [
+        TestFixedArrays,
+        TestReadPrimitiveElements,
+        TestClassifyType,
+        TestStringDecoding,
+    ]
+
+    total_passed = 0
+    total_failed = 0
+    failures = []
+
+    for test_class in test_classes:
+        instance = test_class()
+        class_name = test_class.__name__
+
+        for method_name in dir(instance):
+            if method_name.startswith('test_'):
+                try:
+                    getattr(instance, method_name)()
+                    print(f"  ✓ {class_name}.{method_name}")
+                    total_passed += 1
+                except AssertionError as e:
+                    print(f"  ✗ {class_name}.{method_name}")
+                    failures.append((f"{class_name}.{method_name}", str(e), traceback.format_exc()))
+                    total_failed += 1
+                except Exception as e:
+                    print(f"  ✗ {class_name}.{method_name} (Exception: {e})")
+                    failures.append((f"{class_name}.{method_name}", str(e), traceback.format_exc()))
+                    total_failed += 1
+
+    print()
+    print(f"Serializer Tests: {total_passed}/{total_passed + total_failed} passed")
+
+    if failures:
+        print("\nFailures:")
+        for name, msg, tb in failures:
+            print(f"  {name}: {msg}")
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
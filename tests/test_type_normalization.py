@@ -13,6 +13,9 @@ import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from python.ferrumpy.serializer import (
+    _NORMALIZATION_RE,
+    _NORMALIZATION_REPLACEMENTS,
+    TYPE_NORMALIZATION,
     _remove_allocators,
     _simplify_module_path,
     _split_generic_params,
@@ -104,6 +107,69 @@ class TestGenericParamSplitting:
         result = _split_generic_params('Vec<Vec<i32>>, HashMap<String, Vec<i64>>')
         assert result == ['Vec<Vec<i32>>', 'HashMap<String, Vec<i64>>']
 
+    def test_commas_inside_nested_generics(self):
+        result = _split_generic_params('HashMap<String, Vec<Option<i32>>>, Result<Vec<u8>, String>, u8')
+        assert result == ['HashMap<String, Vec<Option<i32>>>', 'Result<Vec<u8>, String>', 'u8']
+
+    def test_whitespace_stripped(self):
+        result = _split_generic_params('  Vec<i32> ,Option< String >  ')
+        assert result == ['Vec<i32>', 'Option< String >']
+
+
+class TestNormalizationRules:
+    """Test the fused TYPE_NORMALIZATION alternation."""
+
+    SAMPLES = [
+        'alloc::vec::Vec<int, alloc::alloc::Global>',
+        'alloc::vec::Vec<alloc::vec::Vec<int, alloc::alloc::Global>, alloc::alloc::Global>',
+        'alloc::string::String',
+        'alloc::vec::Vec<u8>',
+        'core::option::Option<alloc::string::String>',
+        'core::result::Result<int, alloc::string::String>',
+        'alloc::boxed::Box<rust_sample::User>',
+        'alloc::sync::Arc<rust_sample::User, alloc::alloc::Global>',
+        'alloc::sync::Arc<i32>',
+        'alloc::rc::Rc<int, alloc::alloc::Global>',
+        'alloc::rc::Rc<i32>',
+        '&str',
+        'std::collections::hash::map::HashMap<alloc::string::String, int, std::hash::random::RandomState>',
+        'std::collections::hash::map::HashMap<u8, u8>',
+        'rust_sample::User',
+        'alloc::string::String2',
+    ]
+
+    @staticmethod
+    def _first_rule(type_name):
+        """Reference behaviour: try each rule in list order."""
+        import re
+        for pattern, replacement in TYPE_NORMALIZATION:
+            if re.match(pattern, type_name):
+                return re.sub(pattern, replacement, type_name)
+        return None
+
+    def test_matches_rules_in_order(self):
+        for type_name in self.SAMPLES:
+            m = _NORMALIZATION_RE.match(type_name)
+            fused = m.expand(_NORMALIZATION_REPLACEMENTS[m.lastindex]) if m else None
+            assert fused == self._first_rule(type_name), type_name
+
+    def test_lastindex_selects_rule(self):
+        # One replacement per rule, keyed by the rule's wrapping group
+        assert len(_NORMALIZATION_REPLACEMENTS) == len(TYPE_NORMALIZATION)
+        # lastindex is the wrapping group of the rule that matched, even
+        # though that rule's own groups close inside it
+        m = _NORMALIZATION_RE.match('alloc::sync::Arc<Foo, alloc::alloc::Global>')
+        assert m.group(m.lastindex) == 'alloc::sync::Arc<Foo, alloc::alloc::Global>'
+        # The Global-specific Arc rule wins over the generic one after it
+        assert m.expand(_NORMALIZATION_REPLACEMENTS[m.lastindex]) == 'Arc<Foo>'
+
+    def test_backreferences_renumbered(self):
+        m = _NORMALIZATION_RE.match('core::result::Result<int, alloc::string::String>')
+        assert m.expand(_NORMALIZATION_REPLACEMENTS[m.lastindex]) == 'Result<int, alloc::string::String>'
+        m = _NORMALIZATION_RE.match(
+            'std::collections::hash::map::HashMap<u8, bool, std::hash::random::RandomState>')
+        assert m.expand(_NORMALIZATION_REPLACEMENTS[m.lastindex]) == 'HashMap<u8, bool>'
+
 
 class TestFullNormalization:
     """Test full type normalization pipeline."""
@@ -204,6 +270,7 @@ def run_tests():
         TestAllocatorRemoval,
         TestModulePathSimplification,
         TestGenericParamSplitting,
+        TestNormalizationRules,
         TestFullNormalization,
         TestRealWorldCases,
     ]